@@ -0,0 +1,112 @@
+import base64
+import threading
+
+from django.conf import settings
+from django.db.models import CharField
+from django.db.models.functions import Cast
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+# Separates the key version from the Fernet token in stored values. Fernet
+# tokens are urlsafe base64, so they never contain it.
+VERSION_SEPARATOR = "$"
+
+
+class KeyManager:
+    """
+    Derives the Fernet keys of ``FIELD_ENCRYPTION_KEYS`` once per process.
+
+    Values are encrypted with the first (primary) key and prefixed with its
+    version; values are decrypted with the key their prefix names. Values
+    written before versioning existed carry no prefix and are tried against
+    every key.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fernets = {}
+
+    def _derive(self, secret):
+        # Use the secret to derive an encryption key
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=b"scamshield",  # Should be a constant value
+            iterations=100000,
+        )
+        return base64.urlsafe_b64encode(kdf.derive(secret.encode()))
+
+    def fernet(self, version):
+        secret = settings.FIELD_ENCRYPTION_KEYS[version]
+        cache_key = (version, secret)
+        fernet = self._fernets.get(cache_key)
+        if fernet is None:
+            with self._lock:
+                fernet = self._fernets.get(cache_key)
+                if fernet is None:
+                    fernet = Fernet(self._derive(secret))
+                    self._fernets[cache_key] = fernet
+        return fernet
+
+    @property
+    def primary_version(self):
+        return next(iter(settings.FIELD_ENCRYPTION_KEYS))
+
+    def multi_fernet(self):
+        return MultiFernet(
+            [self.fernet(version) for version in settings.FIELD_ENCRYPTION_KEYS]
+        )
+
+    def version_of(self, token):
+        version, separator, _ = token.partition(VERSION_SEPARATOR)
+        return version if separator else None
+
+    def encrypt(self, value):
+        version = self.primary_version
+        token = self.fernet(version).encrypt(value.encode()).decode()
+        return f"{version}{VERSION_SEPARATOR}{token}"
+
+    def decrypt(self, token):
+        version, separator, body = token.partition(VERSION_SEPARATOR)
+        if separator and version in settings.FIELD_ENCRYPTION_KEYS:
+            return self.fernet(version).decrypt(body.encode()).decode()
+        return self.multi_fernet().decrypt(token.encode()).decode()
+
+    def decrypt_many(self, tokens):
+        """
+        Decrypt a sequence of stored values; values that cannot be decrypted
+        are returned unchanged, as ``EncryptedField`` does.
+        """
+        results = []
+        for token in tokens:
+            if token is None:
+                results.append(None)
+                continue
+            try:
+                results.append(self.decrypt(token))
+            except InvalidToken:
+                results.append(token)
+        return results
+
+
+key_manager = KeyManager()
+
+
+def raw_values(queryset, field_name):
+    """
+    ``(pk, stored value)`` pairs of an encrypted field, without decrypting.
+    """
+    return queryset.annotate(
+        _encrypted=Cast(field_name, output_field=CharField())
+    ).values_list("pk", "_encrypted")
+
+
+def decrypt_queryset(queryset, field_name):
+    """
+    ``{pk: plaintext}`` of an encrypted field for every row of ``queryset``,
+    fetched in one query and decrypted in bulk.
+    """
+    rows = list(raw_values(queryset, field_name))
+    plaintexts = key_manager.decrypt_many([token for _, token in rows])
+    return {pk: plaintext for (pk, _), plaintext in zip(rows, plaintexts)}
@@ -0,0 +1,65 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from authy.Fields import EncryptedField
+from authy.keys import VERSION_SEPARATOR, key_manager, raw_values
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-encrypt every EncryptedField value with the primary key of "
+        "FIELD_ENCRYPTION_KEYS"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows re-encrypted per transaction",
+        )
+
+    def handle(self, *args, **options):
+        primary = key_manager.primary_version
+        prefix = f"{primary}{VERSION_SEPARATOR}"
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, EncryptedField):
+                    self._rotate(model, field, prefix, options["batch_size"])
+
+    def _rotate(self, model, field, prefix, batch_size):
+        stale = (
+            model._default_manager.exclude(**{f"{field.attname}__startswith": prefix})
+            .exclude(**{f"{field.attname}__isnull": True})
+            .order_by("pk")
+        )
+        rotated = failed = 0
+        last_pk = None
+        while True:
+            batch = stale if last_pk is None else stale.filter(pk__gt=last_pk)
+            rows = list(raw_values(batch, field.attname)[:batch_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            instances = []
+            plaintexts = key_manager.decrypt_many([token for _, token in rows])
+            for (pk, token), plaintext in zip(rows, plaintexts):
+                if plaintext == token:
+                    # Not decryptable with any configured key; leave it alone
+                    failed += 1
+                    continue
+                instance = model(pk=pk)
+                setattr(instance, field.attname, plaintext)
+                instances.append(instance)
+
+            with transaction.atomic():
+                model._default_manager.bulk_update(instances, [field.attname])
+            rotated += len(instances)
+
+        label = f"{model._meta.label}.{field.name}"
+        self.stdout.write(self.style.SUCCESS(f"{label}: re-encrypted {rotated} values"))
+        if failed:
+            self.stdout.write(
+                self.style.WARNING(f"{label}: {failed} values could not be decrypted")
+            )
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authy", "0002_merchant"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MerchantUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("endpoint", models.CharField(max_length=50)),
+                ("day", models.DateField()),
+                ("count", models.PositiveBigIntegerField(default=0)),
+                (
+                    "merchant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="usage",
+                        to="authy.merchant",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-day", "endpoint"],
+                "unique_together": {("merchant", "endpoint", "day")},
+            },
+        ),
+    ]
@@ -34,4 +34,22 @@ class Merchant(models.Model):
     def save(self, *args, **kwargs):
         if self.api_key:
             self.api_key_hash = hashlib.sha256(self.api_key.encode()).hexdigest()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class MerchantUsage(models.Model):
+    """Calls a merchant made to an endpoint on one day (UTC)"""
+
+    merchant = models.ForeignKey(
+        Merchant, on_delete=models.CASCADE, related_name="usage"
+    )
+    endpoint = models.CharField(max_length=50)
+    day = models.DateField()
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("merchant", "endpoint", "day")
+        ordering = ["-day", "endpoint"]
+
+    def __str__(self):
+        return f"{self.merchant_id} {self.endpoint} {self.day}: {self.count}"
@@ -1,10 +1,16 @@
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework import serializers
-from authy.models import Merchant
+from authy.models import Merchant, MerchantUsage
 
 
 class MerchantSerializer(serializers.ModelSerializer):
     class Meta:
         model = Merchant
         fields = ["id","api_key"]
+
+
+class MerchantUsageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MerchantUsage
+        fields = ["endpoint", "day", "count"]
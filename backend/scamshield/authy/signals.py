@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from authy.models import Merchant, User
+from scamshield.authentication import merchant_keys, wallet_users
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_wallet_user(sender, instance, **kwargs):
+    if instance.wallet_address:
+        wallet_users.forget(instance.wallet_address)
+
+
+@receiver(post_save, sender=User)
+@receiver(pre_delete, sender=User)
+def forget_cached_merchant_user(sender, instance, created=False, **kwargs):
+    # Cached merchants carry their user. Deletes are handled before the
+    # cascade removes the merchant, while it can still be looked up.
+    if created:
+        return
+    digests = Merchant.objects.filter(user=instance).values_list(
+        "api_key_hash", flat=True
+    )
+    for digest in digests:
+        if digest:
+            merchant_keys.forget(digest)
+
+
+@receiver(pre_save, sender=Merchant)
+def forget_replaced_api_key(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    previous = (
+        Merchant.objects.filter(pk=instance.pk)
+        .values_list("api_key_hash", flat=True)
+        .first()
+    )
+    if previous:
+        merchant_keys.forget(previous)
+
+
+@receiver(post_delete, sender=Merchant)
+def forget_deleted_api_key(sender, instance, **kwargs):
+    if instance.api_key_hash:
+        merchant_keys.forget(instance.api_key_hash)
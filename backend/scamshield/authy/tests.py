@@ -1,3 +1,126 @@
-from django.test import TestCase
+import datetime
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from authy.keys import key_manager, raw_values
+from authy.models import Merchant, MerchantUsage, User
+from scamshield.authentication import (
+    MerchantApiKeyAuthentication,
+    merchant_keys,
+    wallet_users,
+)
+
+
+class MerchantUsageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(wallet_address="0x" + "ab" * 20)
+        cls.merchant = Merchant.objects.create(user=cls.user, api_key="k" * 48)
+        MerchantUsage.objects.create(
+            merchant=cls.merchant,
+            endpoint="scammer-check",
+            day=datetime.date(2024, 2, 10),
+            count=7,
+        )
+
+    def setUp(self):
+        wallet_users.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_WALLET_ADDRESS=self.user.wallet_address)
+        self.url = f"/merchants/{self.merchant.id}/usage/"
+
+    def test_range(self):
+        response = self.client.get(
+            self.url, {"since": "2024-02-01", "until": "2024-02-29"}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data["totals"], {"scammer-check": 7})
+
+    def test_invalid_dates(self):
+        for params in (
+            {"since": "2024-02-31"},
+            {"until": "2024-13-01"},
+            {"since": "yesterday"},
+            {"since": "2024-03-01", "until": "2024-02-01"},
+        ):
+            with self.subTest(**params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400, response.content)
+
+
+class KeyRotationTests(TestCase):
+    old_keys = {"1": "first secret"}
+    new_keys = {"2": "second secret", "1": "first secret"}
+
+    def stored(self):
+        return dict(raw_values(Merchant.objects.all(), "api_key"))
+
+    def test_rotate(self):
+        with override_settings(FIELD_ENCRYPTION_KEYS=self.old_keys):
+            current = Merchant.objects.create(api_key="current-key")
+            legacy = Merchant.objects.create(api_key="placeholder")
+            # Written before values carried a key version
+            token = key_manager.fernet("1").encrypt(b"legacy-key").decode()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE authy_merchant SET api_key = %s WHERE id = %s",
+                    [token, legacy.id],
+                )
+            self.assertTrue(self.stored()[current.id].startswith("1$"))
+
+        with override_settings(FIELD_ENCRYPTION_KEYS=self.new_keys):
+            # Old ciphertexts still decrypt before rotation
+            current.refresh_from_db()
+            legacy.refresh_from_db()
+            self.assertEqual(current.api_key, "current-key")
+            self.assertEqual(legacy.api_key, "legacy-key")
+
+            output = StringIO()
+            call_command("rotate_encryption_keys", stdout=output)
+            self.assertIn(
+                "authy.Merchant.api_key: re-encrypted 2 values", output.getvalue()
+            )
+            for token in self.stored().values():
+                self.assertTrue(token.startswith("2$"), token)
+
+        # Key 1 can be retired once everything is rewritten
+        with override_settings(FIELD_ENCRYPTION_KEYS={"2": "second secret"}):
+            current.refresh_from_db()
+            legacy.refresh_from_db()
+            self.assertEqual(current.api_key, "current-key")
+            self.assertEqual(legacy.api_key, "legacy-key")
+
+
+class MerchantKeyCacheTests(TestCase):
+    def setUp(self):
+        merchant_keys.clear()
+        self.user = User.objects.create(wallet_address="0x" + "34" * 20)
+        Merchant.objects.create(user=self.user, api_key="cached-key")
+        self.request = RequestFactory().get("/", HTTP_X_API_KEY="cached-key")
+
+    def authenticate(self):
+        return MerchantApiKeyAuthentication().authenticate(self.request)
+
+    def test_requests_get_their_own_user(self):
+        first_user, first_merchant = self.authenticate()
+        first_user.wallet_address = "changed in one request"
+        second_user, second_merchant = self.authenticate()
+        self.assertIsNot(first_user, second_user)
+        self.assertIs(second_merchant.user, second_user)
+        self.assertEqual(second_user.wallet_address, self.user.wallet_address)
+
+    def test_user_changes_evict_the_merchant(self):
+        self.authenticate()
+        self.user.wallet_address = "0x" + "56" * 20
+        self.user.save()
+        user, _ = self.authenticate()
+        self.assertEqual(user.wallet_address, "0x" + "56" * 20)
+
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
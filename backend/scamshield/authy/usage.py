@@ -0,0 +1,102 @@
+import atexit
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from authy.models import MerchantUsage
+
+
+class UsageMeter:
+    """
+    Counts merchant calls in memory and adds them to ``MerchantUsage`` from a
+    background thread every ``USAGE_FLUSH_INTERVAL`` seconds, so recording a
+    call never touches the database.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def record(self, merchant_id, endpoint):
+        key = (merchant_id, endpoint, timezone.now().date())
+        with self._lock:
+            self._counts[key] += 1
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="usage-meter", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                # Counts are kept for the next attempt
+                pass
+            finally:
+                close_old_connections()
+
+    def stop(self):
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def pending(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def flush(self):
+        """
+        Add the buffered counts to the usage table. Returns the number of
+        calls written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                counts, self._counts = self._counts, Counter()
+            if not counts:
+                return 0
+            try:
+                with transaction.atomic():
+                    for key, count in counts.items():
+                        self._add(*key, count)
+            except Exception:
+                with self._lock:
+                    self._counts.update(counts)
+                raise
+            return sum(counts.values())
+
+    def _add(self, merchant_id, endpoint, day, count):
+        rows = MerchantUsage.objects.filter(
+            merchant_id=merchant_id, endpoint=endpoint, day=day
+        )
+        if rows.update(count=F("count") + count):
+            return
+        try:
+            with transaction.atomic():
+                MerchantUsage.objects.create(
+                    merchant_id=merchant_id, endpoint=endpoint, day=day, count=count
+                )
+        except IntegrityError:
+            # Another process created the row first
+            rows.update(count=F("count") + count)
+
+
+usage_meter = UsageMeter(settings.USAGE_FLUSH_INTERVAL)
@@ -1,14 +1,31 @@
 from rest_framework import viewsets, permissions
-from authy.models import Merchant
-from authy.serializers import MerchantSerializer
+from authy.models import Merchant, MerchantUsage
+from authy.serializers import MerchantSerializer, MerchantUsageSerializer
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import action
 import secrets
 import string
+from django.db.models import Sum
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from datetime import timedelta
 
+
+def date_param(params, name):
+    """
+    The YYYY-MM-DD date in query parameter ``name``, if given. Raises
+    ValueError when it is malformed or not a real day, e.g. 2024-02-31.
+    """
+    value = params.get(name)
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(f"Invalid date: {value}")
+    return day
+
+
 class MerchantViewSet(viewsets.ModelViewSet):
     queryset = Merchant.objects.all()
     serializer_class = MerchantSerializer
@@ -34,3 +51,42 @@ class MerchantViewSet(viewsets.ModelViewSet):
         merchant.save()
 
         return Response({"api_key": api_key}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["get"])
+    def usage(self, request, pk=None):
+        """
+        Daily calls per endpoint, for the last 30 days unless ``since``/``until``
+        (YYYY-MM-DD) are given. Counts are written in batches, so the last few
+        seconds of calls may not be included yet.
+        """
+        merchant = self.get_object()
+        params = request.query_params
+        try:
+            until = date_param(params, "until") or timezone.now().date()
+            since = date_param(params, "since") or until - timedelta(days=30)
+        except ValueError:
+            return Response(
+                {"detail": "since and until must be dates as YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if since > until:
+            return Response(
+                {"detail": "since must not be after until"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = MerchantUsage.objects.filter(
+            merchant=merchant, day__gte=since, day__lte=until
+        )
+        totals = {
+            row["endpoint"]: row["total"]
+            for row in rows.values("endpoint").annotate(total=Sum("count"))
+        }
+        return Response(
+            {
+                "since": since,
+                "until": until,
+                "totals": totals,
+                "days": MerchantUsageSerializer(rows, many=True).data,
+            }
+        )
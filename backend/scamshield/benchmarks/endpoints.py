@@ -0,0 +1,247 @@
+"""
+Throughput and latency percentiles of the API endpoints, comparable across
+commits.
+
+Point it at a running server holding a generated dataset:
+
+    python manage.py generate_dataset --reports 1000000
+    python manage.py runserver --noreload  # or gunicorn -c gunicorn.conf.py ...
+    python benchmarks/endpoints.py --output bench-$(git rev-parse --short HEAD).json
+
+then compare two runs:
+
+    python benchmarks/endpoints.py --compare bench-abc1234.json bench-def5678.json
+
+Report ids, scammer and reporter addresses are sampled from the report list,
+so lookups hit hot addresses about as often as real traffic would.
+``verify-transaction`` calls the Sui node; run it against ``sui_standin``.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# name: (method, path template, authenticated)
+ENDPOINTS = {
+    "reports-list": ("GET", "/reports/", True),
+    "reports-list-filtered": (
+        "GET",
+        "/reports/?status=pending&scam_type={scam_type}",
+        True,
+    ),
+    "reports-detail": ("GET", "/reports/{report_id}/", True),
+    "my-reports": ("GET", "/my-reports/", True),
+    "pending-verifications": ("GET", "/pending-verifications/", True),
+    "dashboard-stats": ("GET", "/dashboard-stats/", True),
+    "scammer-check": ("GET", "/scammer-check/?address={scammer}", False),
+    "verify-transaction": ("POST", "/api/verify-sui-transaction/", False),
+}
+DEFAULT_ENDPOINTS = [name for name in ENDPOINTS if name != "verify-transaction"]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def sample(client, size):
+    """
+    Report ids and addresses to build requests from.
+    """
+    response = await client.get(
+        "/reports/",
+        params={"page_size": 100},
+        headers={"X-Wallet-Address": "0xbenchmark"},
+    )
+    response.raise_for_status()
+    results = response.json()["results"]
+    if not results:
+        sys.exit("The database has no reports; run generate_dataset first")
+    pages = max(response.json()["count"] // 100, 1)
+    for page in random.sample(range(2, pages + 1), min(size // 100, pages - 1)):
+        response = await client.get(
+            "/reports/",
+            params={"page_size": 100, "page": page},
+            headers={"X-Wallet-Address": "0xbenchmark"},
+        )
+        results += response.json()["results"]
+    return results
+
+
+def build_request(name, reports):
+    method, template, authenticated = ENDPOINTS[name]
+    report = random.choice(reports)
+    headers = {"X-Wallet-Address": report["reporter_address"]} if authenticated else {}
+    url = template.format(
+        report_id=report["id"],
+        scammer=report["scammer_address"],
+        scam_type=report["scam_type"],
+    )
+    body = None
+    if name == "verify-transaction":
+        body = {
+            "transaction_hash": f"bench{random.getrandbits(32):08x}",
+            "report": report["id"],
+        }
+    return method, url, headers, body
+
+
+async def run_endpoint(client, name, reports, args):
+    latencies = []
+    statuses = {}
+
+    async def user(deadline, record):
+        while time.perf_counter() < deadline:
+            method, url, headers, body = build_request(name, reports)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, headers=headers, json=body)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            if record:
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    for seconds, record in ((args.warmup, False), (args.seconds, True)):
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*(user(deadline, record) for _ in range(args.concurrency)))
+
+    latencies.sort()
+    ok = sum(count for status, count in statuses.items() if status.startswith("2"))
+    return {
+        "requests": len(latencies),
+        "errors": len(latencies) - ok,
+        "statuses": statuses,
+        "rps": len(latencies) / args.seconds,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p90_ms": percentile(latencies, 0.9) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results):
+    print(
+        f"{'endpoint':<24}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}"
+        f"{'p99 ms':>10}{'errors':>8}"
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<24}{r['rps']:>10.1f}{r['p50_ms']:>10.1f}{r['p90_ms']:>10.1f}"
+            f"{r['p99_ms']:>10.1f}{r['errors']:>8}"
+        )
+
+
+def compare(before_path, after_path):
+    before = json.loads(Path(before_path).read_text())
+    after = json.loads(Path(after_path).read_text())
+    print(f"{before['revision']} -> {after['revision']}")
+    print(f"{'endpoint':<24}{'req/s':>22}{'p50 ms':>22}{'p99 ms':>22}")
+
+    def change(old, new, fmt):
+        delta = (new - old) / old * 100 if old else 0.0
+        return f"{old:{fmt}} -> {new:{fmt}} {delta:+5.0f}%"
+
+    for name, new in after["endpoints"].items():
+        old = before["endpoints"].get(name)
+        if old is None:
+            continue
+        print(
+            f"{name:<24}"
+            f"{change(old['rps'], new['rps'], '6.0f'):>22}"
+            f"{change(old['p50_ms'], new['p50_ms'], '5.1f'):>22}"
+            f"{change(old['p99_ms'], new['p99_ms'], '5.1f'):>22}"
+        )
+
+
+async def benchmark(args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        reports = await sample(client, args.sample)
+        results = {}
+        for name in args.endpoints.split(","):
+            results[name] = await run_endpoint(client, name, reports, args)
+            print(f"{name}: {results[name]['rps']:.1f} req/s", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoints", default=",".join(DEFAULT_ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=1000,
+        help="Reports to draw request parameters from",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BEFORE", "AFTER"),
+        help="Compare two result files instead of running",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    unknown = set(args.endpoints.split(",")) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+    random.seed(args.seed)
+    results = asyncio.run(benchmark(args))
+    print_results(results)
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(
+                {
+                    "revision": git_revision(),
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "config": {
+                        "base_url": args.base_url,
+                        "concurrency": args.concurrency,
+                        "seconds": args.seconds,
+                    },
+                    "endpoints": results,
+                },
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
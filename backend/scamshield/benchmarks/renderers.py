@@ -0,0 +1,124 @@
+"""
+CPU time and bytes on the wire of JSON responses: DRF's JSONRenderer against
+the orjson renderer, then gzip and brotli at several levels.
+
+Payloads are the report list, a report detail and the dashboard, rendered
+from a generated dataset in a fresh database:
+
+    python benchmarks/renderers.py --reports 2000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def _setup(env):
+    os.environ.update(env)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "scamshield.settings")
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+
+    django.setup()
+
+
+def cpu_time(fn, iterations):
+    """
+    Mean process CPU seconds per call.
+    """
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started) / iterations
+
+
+def payloads(reports):
+    from django.core.management import call_command
+    from django.db.models import Count
+    from rest_framework.test import APIClient
+
+    from core.models import ScamReport
+
+    call_command("generate_dataset", reports=reports, stdout=StringIO())
+    report = (
+        ScamReport.objects.annotate(votes=Count("verifications"))
+        .order_by("-votes")
+        .first()
+    )
+    client = APIClient()
+    client.credentials(HTTP_X_WALLET_ADDRESS=report.reporter_address)
+    urls = {
+        "list (100)": "/reports/?page_size=100",
+        "list (10)": "/reports/",
+        "detail": f"/reports/{report.id}/",
+        "dashboard": "/dashboard-stats/",
+    }
+    return {name: client.get(url).data for name, url in urls.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            "SQLITE_PATH": os.path.join(tmp, "bench.sqlite3"),
+            "REQUEST_PROFILING_SAMPLE_RATE": "0",
+        }
+        subprocess.run(
+            [sys.executable, str(BASE_DIR / "manage.py"), "migrate", "-v0"],
+            env={**os.environ, **env},
+            check=True,
+        )
+        _setup(env)
+        data = payloads(args.reports)
+
+    import brotli
+    from rest_framework.renderers import JSONRenderer
+
+    from scamshield.renderers import ORJSONRenderer
+
+    print(f"{'payload':<12}{'renderer':<10}{'bytes':>10}{'us/render':>12}")
+    rendered = {}
+    for name, payload in data.items():
+        for label, renderer in (("drf", JSONRenderer()), ("orjson", ORJSONRenderer())):
+            body = renderer.render(payload)
+            seconds = cpu_time(lambda: renderer.render(payload), args.iterations)
+            print(f"{name:<12}{label:<10}{len(body):>10}{seconds * 1e6:>12.1f}")
+        drf, fast = JSONRenderer().render(payload), ORJSONRenderer().render(payload)
+        assert json.loads(drf) == json.loads(fast), f"{name}: renderers disagree"
+        rendered[name] = fast
+
+    codecs = {
+        "gzip-6": lambda b: gzip.compress(b, compresslevel=6, mtime=0),
+        "gzip-9": lambda b: gzip.compress(b, compresslevel=9, mtime=0),
+        "br-4": lambda b: brotli.compress(b, quality=4),
+        "br-11": lambda b: brotli.compress(b, quality=11),
+    }
+    print()
+    print(
+        f"{'payload':<12}{'encoding':<10}{'bytes':>10}{'ratio':>8}{'us/response':>14}"
+    )
+    for name, body in rendered.items():
+        for label, codec in codecs.items():
+            size = len(codec(body))
+            seconds = cpu_time(lambda: codec(body), args.iterations)
+            print(
+                f"{name:<12}{label:<10}{size:>10}{len(body) / size:>8.1f}"
+                f"{seconds * 1e6:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
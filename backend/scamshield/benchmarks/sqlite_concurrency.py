@@ -0,0 +1,184 @@
+"""
+Concurrent reader/writer throughput of SQLite with and without the
+SQLITE_PRODUCTION profile.
+
+Writers run the verification write path (insert a Verification, bump the
+report's counter, add a TimelineEvent), syncers claim and release report
+leases as sync_reports does, and readers run the scammer-check query, each
+in its own process against a fresh database:
+
+    python benchmarks/sqlite_concurrency.py --writers 4 --syncers 2 --readers 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PROFILES = {
+    "default": {},
+    "production": {"SQLITE_PRODUCTION": "1"},
+}
+ADDRESSES = 200
+
+
+def _setup(env):
+    os.environ.update(env)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "scamshield.settings")
+    sys.path.insert(0, str(BASE_DIR))
+    import django
+
+    django.setup()
+
+
+def seed(env, reports):
+    _setup(env)
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from core.models import ScamReport
+
+    now = timezone.now()
+    ScamReport.objects.bulk_create(
+        [
+            ScamReport(
+                title=f"Report {i}",
+                description="Seeded for the SQLite benchmark",
+                scammer_address=f"0x{i % ADDRESSES:040x}",
+                reporter_address=f"0x{i:040x}",
+                scam_type="phishing",
+                risk_level=random.choice(["low", "medium", "high", "critical"]),
+                stake_amount=random.randint(1, 20),
+                transaction_amount=random.randint(10, 50000),
+                verification_deadline=now + timedelta(days=3),
+            )
+            for i in range(reports)
+        ],
+        batch_size=500,
+    )
+
+
+def worker(env, role, start, seconds, results):
+    _setup(env)
+    from django.db import OperationalError, transaction
+    from django.db.models import F
+    from django.utils import timezone
+
+    from core.leases import claim_reports, release_reports
+    from core.models import ScamReport, TimelineEvent, Verification
+    from core.utils import SCAM_SCORE_FIELDS
+
+    report_ids = list(ScamReport.objects.values_list("id", flat=True))
+    ops = errors = 0
+    latencies = []
+    while time.time() < start:
+        time.sleep(0.001)
+    deadline = start + seconds
+    while time.time() < deadline:
+        began = time.perf_counter()
+        try:
+            if role == "writer":
+                report_id = random.choice(report_ids)
+                with transaction.atomic():
+                    Verification.objects.create(
+                        report_id=report_id,
+                        verifier=uuid.uuid4().hex[:42],
+                        verified=True,
+                    )
+                    ScamReport.objects.filter(pk=report_id).update(
+                        verification_count=F("verification_count") + 1
+                    )
+                    TimelineEvent.objects.create(
+                        report_id=report_id, date=timezone.now(), event="Verified"
+                    )
+            elif role == "syncer":
+                worker_id = f"bench-{os.getpid()}"
+                reports = claim_reports(ScamReport.objects.all(), worker_id, 20, 60)
+                release_reports(reports, worker_id)
+            else:
+                address = f"0x{random.randrange(ADDRESSES):040x}"
+                list(
+                    ScamReport.objects.filter(scammer_address__iexact=address).only(
+                        *SCAM_SCORE_FIELDS
+                    )
+                )
+            ops += 1
+            latencies.append(time.perf_counter() - began)
+        except OperationalError:
+            # "database is locked"
+            errors += 1
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+    results.put((role, ops, errors, p99))
+
+
+def run(profile, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**PROFILES[profile], "SQLITE_PATH": os.path.join(tmp, "bench.sqlite3")}
+        subprocess.run(
+            [sys.executable, str(BASE_DIR / "manage.py"), "migrate", "-v0"],
+            env={**os.environ, **env},
+            check=True,
+        )
+        context = multiprocessing.get_context("spawn")
+        seeder = context.Process(target=seed, args=(env, args.reports))
+        seeder.start()
+        seeder.join()
+
+        results = context.Queue()
+        start = time.time() + 3  # let every process finish setting up
+        roles = (
+            ["writer"] * args.writers
+            + ["syncer"] * args.syncers
+            + ["reader"] * args.readers
+        )
+        processes = [
+            context.Process(
+                target=worker, args=(env, role, start, args.seconds, results)
+            )
+            for role in roles
+        ]
+        for process in processes:
+            process.start()
+        totals = {}
+        for _ in processes:
+            role, ops, errors, p99 = results.get()
+            total = totals.setdefault(role, [0, 0, 0.0])
+            total[0] += ops
+            total[1] += errors
+            total[2] = max(total[2], p99)
+        for process in processes:
+            process.join()
+
+    for role, (ops, errors, p99) in sorted(totals.items()):
+        print(
+            f"{profile:<11} {role:<7} {ops / args.seconds:>10.1f} ops/s "
+            f"{errors:>7} locked {p99 * 1000:>9.1f} ms p99"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--syncers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--reports", type=int, default=5000)
+    parser.add_argument(
+        "--profiles", default=",".join(PROFILES), help="Comma separated profiles to run"
+    )
+    args = parser.parse_args()
+    for profile in args.profiles.split(","):
+        run(profile, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,29 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import F, Sum
+from django.template.defaultfilters import filesizeformat
 
-# Register your models here.
+from core.models import EvidenceBlob
+
+
+@admin.register(EvidenceBlob)
+class EvidenceBlobAdmin(admin.ModelAdmin):
+    list_display = ("hash", "size", "ref_count", "created_at")
+    readonly_fields = ("hash", "file", "size", "ref_count", "created_at")
+    ordering = ("-ref_count",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        totals = EvidenceBlob.objects.aggregate(
+            stored=Sum("size"), referenced=Sum(F("size") * F("ref_count"))
+        )
+        stored = totals["stored"] or 0
+        saved = (totals["referenced"] or 0) - stored
+        messages.info(
+            request,
+            f"Deduplication saved {filesizeformat(saved)}: "
+            f"{filesizeformat(stored)} stored for "
+            f"{filesizeformat(stored + saved)} of evidence.",
+        )
+        return super().changelist_view(request, extra_context)
@@ -0,0 +1,139 @@
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from core.models import EvidenceBlob
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".webm", ".mkv", ".avi", ".m4v")
+
+
+def derived_name(blob, suffix):
+    return f"evidence/derived/{blob.hash[:2]}/{blob.hash}_{suffix}"
+
+
+def _image_rendition(image, size, quality):
+    rendition = image.copy()
+    rendition.thumbnail((size, size))
+    if rendition.mode not in ("RGB", "L"):
+        rendition = rendition.convert("RGB")
+    output = io.BytesIO()
+    rendition.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    return ContentFile(output.getvalue())
+
+
+def _build_image(blob):
+    with blob.file.open("rb") as f:
+        with Image.open(f) as image:
+            image = ImageOps.exif_transpose(image)
+            thumbnail = _image_rendition(image, settings.EVIDENCE_THUMBNAIL_SIZE, 70)
+            preview = _image_rendition(image, settings.EVIDENCE_PREVIEW_SIZE, 80)
+    return (
+        default_storage.save(derived_name(blob, "thumb.jpg"), thumbnail),
+        default_storage.save(derived_name(blob, "preview.jpg"), preview),
+    )
+
+
+def _local_copy(blob, workdir):
+    try:
+        return default_storage.path(blob.file.name)
+    except NotImplementedError:
+        path = os.path.join(workdir, "source")
+        with blob.file.open("rb") as src, open(path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        return path
+
+
+def _build_video(blob, ffmpeg):
+    with tempfile.TemporaryDirectory() as workdir:
+        source = _local_copy(blob, workdir)
+        thumbnail = os.path.join(workdir, "thumb.jpg")
+        preview = os.path.join(workdir, "preview.mp4")
+        size = settings.EVIDENCE_THUMBNAIL_SIZE
+        subprocess.run(
+            [
+                ffmpeg,
+                "-v",
+                "error",
+                "-y",
+                "-ss",
+                "1",
+                "-i",
+                source,
+                "-frames:v",
+                "1",
+                "-vf",
+                f"scale='min({size},iw)':-2",
+                thumbnail,
+            ],
+            check=True,
+            timeout=120,
+        )
+        size = settings.EVIDENCE_PREVIEW_SIZE
+        subprocess.run(
+            [
+                ffmpeg,
+                "-v",
+                "error",
+                "-y",
+                "-i",
+                source,
+                "-vf",
+                f"scale='min({size},iw)':-2",
+                "-c:v",
+                "libx264",
+                "-crf",
+                "32",
+                "-preset",
+                "veryfast",
+                "-c:a",
+                "aac",
+                "-b:a",
+                "64k",
+                "-movflags",
+                "+faststart",
+                preview,
+            ],
+            check=True,
+            timeout=1800,
+        )
+        with open(thumbnail, "rb") as t, open(preview, "rb") as p:
+            return (
+                default_storage.save(derived_name(blob, "thumb.jpg"), File(t)),
+                default_storage.save(derived_name(blob, "preview.mp4"), File(p)),
+            )
+
+
+def build_derivatives(blob):
+    """
+    Create the thumbnail and preview of a blob and record the outcome.
+    """
+    names = None
+    status = "unsupported"
+    try:
+        if blob.file.name.lower().endswith(VIDEO_EXTENSIONS):
+            ffmpeg = shutil.which("ffmpeg")
+            if ffmpeg:
+                names = _build_video(blob, ffmpeg)
+        else:
+            try:
+                names = _build_image(blob)
+            except UnidentifiedImageError:
+                pass
+        if names:
+            status = "ready"
+    except Exception:
+        status = "failed"
+
+    changes = {"derivatives_status": status}
+    if names:
+        changes["thumbnail"], changes["preview"] = names
+    EvidenceBlob.objects.filter(hash=blob.hash).update(**changes)
+    return status
+
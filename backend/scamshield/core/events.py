@@ -0,0 +1,212 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import ScamReport, TimelineEvent, Verification
+from core.sui_service import ON_CHAIN_STATUS
+
+EVENT_NAMES = ("ReportCreated", "ReportVerified", "ReportResolved")
+
+
+def event_name(event):
+    """
+    Short name of a Move event, e.g. ``ReportCreated``.
+    """
+    return (event.get("type") or "").rsplit("::", 1)[-1]
+
+
+def event_fields(event):
+    """
+    Field values of a Move event, for both the current and the legacy RPC shape.
+    """
+    if "parsedJson" in event:
+        return event["parsedJson"] or {}
+    return event.get("event", {}).get("moveEvent", {}).get("fields", {})
+
+
+def _from_ms(value):
+    return datetime.fromtimestamp(int(value) / 1000, tz=dt_timezone.utc)
+
+
+def _status_value(status):
+    # ReportStatus is a struct: {"value": n} or {"fields": {"value": n}}
+    if isinstance(status, dict):
+        status = status.get("fields", status).get("value")
+    return ON_CHAIN_STATUS.get(int(status)) if status is not None else None
+
+
+def _create_reports(events, network):
+    """
+    Insert reports for ReportCreated events that are not in the database yet.
+    """
+    by_object_id = {}
+    for event in events:
+        fields = event_fields(event)
+        if fields.get("report_id"):
+            by_object_id.setdefault(fields["report_id"], fields)
+
+    existing = set(
+        ScamReport.objects.filter(sui_object_id__in=by_object_id).values_list(
+            "sui_object_id", flat=True
+        )
+    )
+
+    now = timezone.now()
+    reports = []
+    for object_id, fields in by_object_id.items():
+        if object_id in existing:
+            continue
+        created_at = _from_ms(fields["created_at"]) if fields.get("created_at") else now
+        deadline = (
+            _from_ms(fields["verification_deadline"])
+            if fields.get("verification_deadline")
+            else created_at + timedelta(days=3)
+        )
+        reports.append(
+            ScamReport(
+                title=f"Report from {fields.get('scam_type', 'unknown')}",
+                scammer_address=fields.get("scammer_address"),
+                reporter_address=fields.get("reporter_address"),
+                scam_type=fields.get("scam_type", "other"),
+                description="Report created on the blockchain",
+                sui_object_id=object_id,
+                stake_amount=int(fields.get("stake_amount", 0)),
+                created_at=created_at,
+                verification_deadline=deadline,
+                status="pending",
+                network=network,
+            )
+        )
+
+    ScamReport.objects.bulk_create(reports)
+    TimelineEvent.objects.bulk_create(
+        TimelineEvent(report=report, date=now, event="Report detected on blockchain")
+        for report in reports
+    )
+    return len(reports)
+
+
+def _apply_verifications(events, reports):
+    """
+    Record ReportVerified events and bump the report counters.
+
+    A verification already stored for the same (report, verifier) pair is
+    skipped, which makes replaying events safe.
+    """
+    seen = set(
+        Verification.objects.filter(report__in=reports.values()).values_list(
+            "report_id", "verifier"
+        )
+    )
+
+    verifications = []
+    deltas = defaultdict(lambda: [0, 0])
+    for event in events:
+        fields = event_fields(event)
+        report = reports.get(fields.get("report_id"))
+        if report is None:
+            continue
+        key = (report.id, fields.get("verifier"))
+        if key in seen:
+            continue
+        seen.add(key)
+
+        verified = bool(fields.get("verified"))
+        timestamp = (
+            _from_ms(fields["timestamp"]) if fields.get("timestamp") else timezone.now()
+        )
+        verifications.append(
+            Verification(
+                report=report,
+                verifier=fields.get("verifier"),
+                verified=verified,
+                comment="",
+                timestamp=timestamp,
+                transaction_hash=event.get("id", {}).get("txDigest"),
+            )
+        )
+        deltas[report.id][0 if verified else 1] += 1
+
+    Verification.objects.bulk_create(verifications)
+    TimelineEvent.objects.bulk_create(
+        TimelineEvent(
+            report=v.report,
+            date=v.timestamp,
+            event=f"{'Verified' if v.verified else 'Rejected'} by {v.verifier[:10]}...",
+        )
+        for v in verifications
+    )
+    for report_id, (verified, rejected) in deltas.items():
+        ScamReport.objects.filter(id=report_id).update(
+            verification_count=F("verification_count") + verified,
+            rejection_count=F("rejection_count") + rejected,
+        )
+    return len(verifications)
+
+
+def _apply_resolutions(events, reports):
+    """
+    Apply the final status and counters carried by ReportResolved events.
+    """
+    latest = {}
+    for event in events:
+        fields = event_fields(event)
+        report = reports.get(fields.get("report_id"))
+        if report is not None:
+            latest[report.id] = fields
+
+    for report_id, fields in latest.items():
+        changes = {}
+        status = _status_value(fields.get("status"))
+        if status:
+            changes["status"] = status
+        if fields.get("verification_count") is not None:
+            changes["verification_count"] = int(fields["verification_count"])
+        if fields.get("rejection_count") is not None:
+            changes["rejection_count"] = int(fields["rejection_count"])
+        if changes:
+            ScamReport.objects.filter(id=report_id).update(**changes)
+    return len(latest)
+
+
+def apply_events(events, network=None):
+    """
+    Apply a batch of report registry events emitted on ``network`` to the database.
+
+    Writes are grouped per event type, so a batch costs a handful of queries
+    no matter how many events it holds. Applying the same batch twice leaves
+    the database unchanged.
+    """
+    grouped = defaultdict(list)
+    for event in events:
+        grouped[event_name(event)].append(event)
+
+    counts = dict.fromkeys(EVENT_NAMES, 0)
+    with transaction.atomic():
+        counts["ReportCreated"] = _create_reports(
+            grouped["ReportCreated"], network or settings.SUI_DEFAULT_NETWORK
+        )
+
+        object_ids = {
+            event_fields(event).get("report_id")
+            for event in grouped["ReportVerified"] + grouped["ReportResolved"]
+        }
+        object_ids.discard(None)
+        reports = {
+            report.sui_object_id: report
+            for report in ScamReport.objects.filter(sui_object_id__in=object_ids).only(
+                "id", "sui_object_id"
+            )
+        }
+
+        counts["ReportVerified"] = _apply_verifications(
+            grouped["ReportVerified"], reports
+        )
+        counts["ReportResolved"] = _apply_resolutions(
+            grouped["ReportResolved"], reports
+        )
+    return counts
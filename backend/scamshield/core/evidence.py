@@ -0,0 +1,281 @@
+import fcntl
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import Evidence, EvidenceBlob, EvidenceUpload
+
+BLOCK_SIZE = 64 * 1024
+
+# Running SHA-256 of in-progress uploads handled by this process, keyed by
+# upload id: (bytes hashed, hasher). A chunk that lands on another process
+# simply leaves the hash to be recomputed from disk on completion.
+_hashers = OrderedDict()
+_hashers_lock = threading.Lock()
+_MAX_HASHERS = 1000
+
+
+class UploadOffsetMismatch(Exception):
+    """
+    A chunk did not start where the upload currently ends.
+    """
+
+    def __init__(self, expected, message=None):
+        super().__init__(message or f"Upload is at offset {expected}")
+        self.expected = expected
+
+
+class IncompleteChunk(Exception):
+    """
+    The request body ended before the announced chunk length.
+    """
+
+
+class UploadAlreadyCompleted(Exception):
+    """
+    The upload was turned into evidence by another request.
+    """
+
+
+def _lock_part(f, upload):
+    """
+    Take the lock serializing writers of an upload's part file, or raise
+    ``UploadOffsetMismatch`` if another request holds it. The lock is
+    released when the file is closed.
+    """
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        raise UploadOffsetMismatch(
+            upload.received, "Another request is writing this upload"
+        ) from None
+
+
+def partial_path(upload):
+    return Path(settings.EVIDENCE_UPLOAD_DIR) / f"{upload.id}.part"
+
+
+def hash_file(f):
+    """
+    SHA-256 of an open binary file, read in fixed-size blocks; leaves it
+    rewound.
+    """
+    hasher = hashlib.sha256()
+    for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+        hasher.update(block)
+    f.seek(0)
+    return hasher.hexdigest()
+
+
+def _remember_hasher(upload_id, offset, hasher):
+    with _hashers_lock:
+        _hashers[upload_id] = (offset, hasher)
+        _hashers.move_to_end(upload_id)
+        while len(_hashers) > _MAX_HASHERS:
+            _hashers.popitem(last=False)
+
+
+def append_chunk(upload, offset, stream, length):
+    """
+    Write ``length`` bytes from ``stream`` at ``offset`` of the upload.
+
+    The body is copied in ``BLOCK_SIZE`` blocks and hashed as it goes, so
+    memory use does not depend on the chunk or file size. Writers of the
+    same upload are serialized by a lock on its part file, taken before the
+    offset is checked, so a losing request never touches the winner's bytes.
+    """
+    if offset != upload.received:
+        raise UploadOffsetMismatch(upload.received)
+
+    path = partial_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o644), "r+b") as f:
+        _lock_part(f, upload)
+        upload.refresh_from_db(fields=["received", "evidence"])
+        if upload.evidence_id:
+            path.unlink(missing_ok=True)
+            raise UploadAlreadyCompleted()
+        if offset != upload.received:
+            raise UploadOffsetMismatch(upload.received)
+
+        if offset == 0:
+            hasher = hashlib.sha256()
+        else:
+            with _hashers_lock:
+                state = _hashers.get(upload.id)
+            hasher = state[1].copy() if state and state[0] == offset else None
+
+        f.seek(offset)
+        while written < length:
+            block = stream.read(min(BLOCK_SIZE, length - written))
+            if not block:
+                break
+            f.write(block)
+            written += len(block)
+            if hasher is not None:
+                hasher.update(block)
+        # Drop bytes left behind by an earlier interrupted chunk
+        f.truncate()
+
+        if written != length:
+            raise IncompleteChunk(f"Expected {length} bytes, received {written}")
+
+        EvidenceUpload.objects.filter(id=upload.id, received=offset).update(
+            received=offset + written
+        )
+        upload.received = offset + written
+        if hasher is not None:
+            _remember_hasher(upload.id, upload.received, hasher)
+    return upload.received
+
+
+def blob_name(digest, filename):
+    extension = os.path.splitext(filename)[1].lower()[:10]
+    return f"evidence/sha256/{digest[:2]}/{digest}{extension}"
+
+
+def hash_upload(file):
+    """
+    SHA-256 of an uploaded file, read chunk by chunk; leaves it rewound.
+    """
+    hasher = hashlib.sha256()
+    for chunk in file.chunks(BLOCK_SIZE):
+        hasher.update(chunk)
+    file.seek(0)
+    return hasher.hexdigest()
+
+
+def store_content(digest, file, filename):
+    """
+    Copy ``file`` to its content address unless a blob already holds it.
+
+    Called outside any transaction, so copying a large file never holds the
+    database write lock. Returns the stored name, or None.
+    """
+    if EvidenceBlob.objects.filter(hash=digest).exists():
+        return None
+    return default_storage.save(blob_name(digest, filename), file)
+
+
+def acquire_blob(digest, file, filename, stored=None):
+    """
+    Reference the blob holding ``digest``, creating it from the content
+    stored by ``store_content`` (or from ``file``) if it does not exist yet.
+    """
+    if EvidenceBlob.objects.filter(hash=digest).update(ref_count=F("ref_count") + 1):
+        if stored:
+            # Someone stored the same content meanwhile; keep theirs
+            transaction.on_commit(lambda: default_storage.delete(stored))
+        return EvidenceBlob.objects.get(hash=digest)
+
+    name = stored or default_storage.save(blob_name(digest, filename), file)
+    try:
+        with transaction.atomic():
+            # Left pending for build_evidence_derivatives to pick up
+            return EvidenceBlob.objects.create(
+                hash=digest, file=name, size=default_storage.size(name), ref_count=1
+            )
+    except IntegrityError:
+        # Someone stored the same content concurrently; keep theirs
+        default_storage.delete(name)
+        EvidenceBlob.objects.filter(hash=digest).update(ref_count=F("ref_count") + 1)
+        return EvidenceBlob.objects.get(hash=digest)
+
+
+def release_blob(digest):
+    """
+    Drop one reference to a blob, deleting it once nothing uses it.
+    """
+    with transaction.atomic():
+        EvidenceBlob.objects.filter(hash=digest).update(ref_count=F("ref_count") - 1)
+        unused = EvidenceBlob.objects.filter(hash=digest, ref_count__lte=0).first()
+        if unused is None:
+            return
+        names = [f.name for f in (unused.file, unused.thumbnail, unused.preview) if f]
+        unused.delete()
+        transaction.on_commit(lambda: [default_storage.delete(name) for name in names])
+
+
+def _new_evidence(report, file, filename, digest, stored, **fields):
+    blob = acquire_blob(digest, file, filename, stored)
+    fields.setdefault("description", f"Evidence file: {filename}")
+    return Evidence.objects.create(
+        report=report, file=blob.file.name, blob=blob, hash=digest, **fields
+    )
+
+
+def create_evidence(report, file, digest=None, **fields):
+    """
+    Create an Evidence for ``file`` backed by a content-addressed blob.
+    """
+    filename = os.path.basename(getattr(file, "name", "") or "evidence")
+    if digest is None:
+        digest = hash_upload(file)
+    stored = store_content(digest, file, filename)
+    with transaction.atomic():
+        return _new_evidence(report, file, filename, digest, stored, **fields)
+
+
+def complete_upload(upload):
+    """
+    Turn a fully received upload into an ``Evidence`` with its SHA-256 set.
+
+    Hashing and copying happen before the upload row is locked; the row is
+    then checked again, so of two concurrent completions only one creates
+    evidence and the other raises ``UploadAlreadyCompleted``.
+    """
+    received = upload.received
+    path = partial_path(upload)
+    try:
+        # Stays readable even if a concurrent completion unlinks it
+        f = open(path, "rb")
+    except FileNotFoundError:
+        raise UploadAlreadyCompleted() from None
+
+    with f:
+        _lock_part(f, upload)
+        with _hashers_lock:
+            state = _hashers.pop(upload.id, None)
+        if state and state[0] == received:
+            digest = state[1].hexdigest()
+        else:
+            digest = hash_file(f)
+
+        file = File(f, name=upload.filename)
+        stored = store_content(digest, file, upload.filename)
+        try:
+            with transaction.atomic():
+                locked = EvidenceUpload.objects.select_for_update().get(id=upload.id)
+                if locked.evidence_id:
+                    raise UploadAlreadyCompleted()
+                if locked.received != received:
+                    raise UploadOffsetMismatch(locked.received)
+                evidence = _new_evidence(
+                    upload.report,
+                    file,
+                    upload.filename,
+                    digest,
+                    stored,
+                    type=upload.type,
+                    description=upload.description
+                    or f"Evidence file: {upload.filename}",
+                )
+                locked.evidence = evidence
+                locked.save(update_fields=["evidence", "updated_at"])
+        except (UploadAlreadyCompleted, UploadOffsetMismatch):
+            if stored:
+                default_storage.delete(stored)
+            raise
+
+    upload.evidence = evidence
+    path.unlink(missing_ok=True)
+    return evidence
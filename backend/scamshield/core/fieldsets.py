@@ -0,0 +1,57 @@
+"""
+Sparse fieldsets: ``?fields=id,title,status`` limits both the serialized
+output and the columns read from the database.
+"""
+
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+
+
+def requested_fields(request):
+    """
+    Field names asked for with ``?fields=``, or None for all of them.
+
+    Only reads honour it, so writes always answer with the full object.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    value = request.query_params.get(FIELDS_PARAM)
+    if not value:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()} | {"id"}
+
+
+class SparseFieldsetMixin:
+    """
+    Drop the serializer fields that were not requested with ``?fields=``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = requested_fields(self.context.get("request"))
+        if requested is not None:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+
+def only_requested(queryset, request, serializer_class, depends_on=None):
+    """
+    Defer the columns of fields left out by ``?fields=``.
+
+    ``depends_on`` maps a computed serializer field to the columns it reads.
+    Relations are left alone; prefetch them based on ``requested_fields``.
+    """
+    requested = requested_fields(request)
+    if requested is None:
+        return queryset
+    model = queryset.model
+    concrete = {
+        field.name for field in model._meta.concrete_fields if not field.is_relation
+    }
+    columns = {model._meta.pk.name}
+    for name in requested & set(serializer_class.Meta.fields):
+        if name in concrete:
+            columns.add(name)
+        columns.update((depends_on or {}).get(name, ()))
+    return queryset.only(*columns)
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import ScamReport
+
+
+def _unleased(now):
+    return Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now)
+
+
+def claim_reports(queryset, worker_id, batch_size, lease_seconds):
+    """
+    Lease up to ``batch_size`` reports from ``queryset`` to ``worker_id``.
+
+    A report stays leased until ``lease_seconds`` have passed, so workers on
+    different machines never process the same report concurrently and a
+    crashed worker's reports become claimable again once its leases expire.
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=lease_seconds)
+    available = queryset.filter(_unleased(now)).order_by("created_at")
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(
+                available.select_for_update(skip_locked=True).values_list(
+                    "id", flat=True
+                )[:batch_size]
+            )
+            ScamReport.objects.filter(id__in=ids).update(
+                lease_owner=worker_id, lease_expires_at=expires_at
+            )
+        else:
+            ids = list(available.values_list("id", flat=True)[:batch_size])
+            # Re-checking the lease in the UPDATE itself means that when two
+            # workers pick the same ids, each row goes to only one of them.
+            ScamReport.objects.filter(_unleased(now), id__in=ids).update(
+                lease_owner=worker_id, lease_expires_at=expires_at
+            )
+
+    return list(
+        ScamReport.objects.filter(
+            id__in=ids, lease_owner=worker_id, lease_expires_at=expires_at
+        )
+    )
+
+
+def release_reports(reports, worker_id):
+    """
+    Give back the leases ``worker_id`` holds on ``reports`` before they expire.
+    """
+    return ScamReport.objects.filter(
+        id__in=[report.id for report in reports], lease_owner=worker_id
+    ).update(lease_owner=None, lease_expires_at=None)
@@ -0,0 +1,187 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from core.events import apply_events
+from core.models import BackfillRange
+from core.sui_service import SuiClient
+
+# Shared between the worker processes to bound concurrent RPC calls
+_rpc_slots = None
+
+
+def _init_worker(rpc_slots):
+    global _rpc_slots
+    import django
+
+    django.setup()
+    _rpc_slots = rpc_slots
+
+
+def fetch_range(network, start_ms, end_ms, page_size):
+    """
+    Fetch every report registry event emitted in ``[start_ms, end_ms)``.
+
+    Pages only the range itself, so ranges are fetched independently of
+    each other. Runs in a worker process; the results are written by the
+    parent so that only one process writes to the database.
+    """
+    client = SuiClient(network)
+    events = []
+    cursor = None
+    while True:
+        with _rpc_slots:
+            page = client.query_module_events_between(
+                start_ms, end_ms, cursor, page_size
+            )
+        events.extend(page["data"])
+        cursor = page.get("nextCursor")
+        if not page.get("hasNextPage") or not cursor:
+            return events
+
+
+def plan_ranges(job, since_ms, until_ms, step_ms):
+    """
+    Create the ranges of at most ``step_ms`` that cover what no completed
+    range of ``job`` covers in ``[since_ms, until_ms)``, and return them.
+
+    Unfinished ranges from an earlier run are replaced, so resuming with a
+    different --range-hours or --until neither skips nor repeats history.
+    """
+    overlapping = BackfillRange.objects.filter(
+        job=job, start_ms__lt=until_ms, end_ms__gt=since_ms
+    )
+    overlapping.filter(completed=False).delete()
+
+    gaps = []
+    position = since_ms
+    for completed in overlapping.filter(completed=True).order_by("start_ms"):
+        if completed.start_ms > position:
+            gaps.append((position, completed.start_ms))
+        position = max(position, completed.end_ms)
+    if position < until_ms:
+        gaps.append((position, until_ms))
+
+    ranges = []
+    for start, end in gaps:
+        while start < end:
+            stop = min(start + step_ms, end)
+            ranges.append(BackfillRange(job=job, start_ms=start, end_ms=stop))
+            start = stop
+    return BackfillRange.objects.bulk_create(ranges)
+
+
+def _parse_moment(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"Invalid date: {value}")
+        moment = datetime.combine(day, datetime.min.time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = "Backfill report registry events over a time range using a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", required=True, help="Start date or datetime")
+        parser.add_argument("--until", help="End date or datetime (default: now)")
+        parser.add_argument(
+            "--network",
+            default=settings.SUI_DEFAULT_NETWORK,
+            choices=list(settings.SUI_NETWORKS),
+        )
+        parser.add_argument(
+            "--job",
+            help="Name under which range progress is stored; rerun with the same "
+            "name to resume (default: <network>:report_registry)",
+        )
+        parser.add_argument(
+            "--range-hours",
+            type=int,
+            default=24,
+            help="Length of each independently processed range",
+        )
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument(
+            "--rpc-concurrency",
+            type=int,
+            default=4,
+            help="Maximum RPC calls in flight across all workers",
+        )
+        parser.add_argument("--page-size", type=int, default=50)
+
+    def handle(self, *args, **options):
+        since = _parse_moment(options["since"])
+        until = _parse_moment(options["until"]) if options["until"] else timezone.now()
+        if since >= until:
+            raise CommandError("--since must be before --until")
+
+        network = options["network"]
+        job = options["job"] or f"{network}:report_registry"
+        pending = plan_ranges(
+            job,
+            int(since.timestamp() * 1000),
+            int(until.timestamp() * 1000),
+            options["range_hours"] * 3600 * 1000,
+        )
+        done = BackfillRange.objects.filter(job=job, completed=True).count()
+        self.stdout.write(
+            f"Backfill {job}: {len(pending)} ranges to process, {done} already completed"
+        )
+        if not pending:
+            return
+
+        # Forked workers must not share the parent's database connections
+        connections.close_all()
+        context = multiprocessing.get_context()
+        rpc_slots = context.BoundedSemaphore(options["rpc_concurrency"])
+
+        total_events = 0
+        executor = ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(rpc_slots,),
+        )
+        try:
+            results = executor.map(
+                fetch_range,
+                [network] * len(pending),
+                [r.start_ms for r in pending],
+                [r.end_ms for r in pending],
+                [options["page_size"]] * len(pending),
+            )
+            # map() yields in submission order, so ranges are merged
+            # chronologically even though they are fetched concurrently.
+            for backfill_range, events in zip(pending, results):
+                with transaction.atomic():
+                    counts = apply_events(events, network)
+                    backfill_range.completed = True
+                    backfill_range.event_count = len(events)
+                    backfill_range.save()
+                total_events += len(events)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Merged {backfill_range}: {len(events)} events "
+                        + ", ".join(f"{name}={count}" for name, count in counts.items())
+                    )
+                )
+        except Exception as e:
+            raise CommandError(
+                f"Backfill interrupted: {str(e)}. Rerun with --job {job} to resume."
+            )
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        self.stdout.write(
+            f"Backfill complete. Processed {len(pending)} ranges with {total_events} events."
+        )
@@ -0,0 +1,88 @@
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from core.derivatives import build_derivatives
+from core.models import EvidenceBlob
+
+BATCH_SIZE = 100
+
+
+def _build(blob):
+    try:
+        return blob.hash, build_derivatives(blob)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = (
+        "Build missing thumbnails and previews of evidence files; with --watch, "
+        "keep building them as uploads leave new blobs pending"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=settings.EVIDENCE_DERIVATIVE_WORKERS
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Also rebuild blobs whose previous attempt failed",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep polling for pending blobs instead of exiting",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait once nothing is pending",
+        )
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        if options["watch"]:
+            signal.signal(signal.SIGINT, self._request_stop)
+            signal.signal(signal.SIGTERM, self._request_stop)
+
+        statuses = ["pending", "failed"] if options["retry_failed"] else ["pending"]
+        counts = {}
+        last = None
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            while not self.stop.is_set():
+                blobs = EvidenceBlob.objects.filter(
+                    derivatives_status__in=statuses
+                ).order_by("hash")
+                if last is not None:
+                    blobs = blobs.filter(hash__gt=last)
+                batch = list(blobs[:BATCH_SIZE])
+                for blob_hash, status in executor.map(_build, batch):
+                    counts[status] = counts.get(status, 0) + 1
+                    self.stdout.write(f"{blob_hash}: {status}")
+                close_old_connections()
+                if batch:
+                    last = batch[-1].hash
+                    continue
+
+                # Went through every blob; with --watch, start over for new
+                # uploads (failed blobs are only retried on the first pass)
+                if not options["watch"]:
+                    break
+                statuses = ["pending"]
+                last = None
+                self.stop.wait(options["poll_interval"])
+
+        self.stdout.write(
+            "Done. "
+            + (", ".join(f"{status}={n}" for status, n in counts.items()) or "Nothing to do.")
+        )
+
+    def _request_stop(self, signum, frame):
+        self.stdout.write("Shutting down after the current batch...")
+        self.stop.set()
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from scamshield.schema import build_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema served at api/schema/. Run it on deploy, "
+        "after the code is in place"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir", help="Directory to write to (default: OPENAPI_SCHEMA_DIR)"
+        )
+
+    def handle(self, *args, **options):
+        for path in build_schema(options["output_dir"]):
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
@@ -1,8 +1,10 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
+import time
 from core.models import ScamReport, TimelineEvent
 from core.sui_service import SuiClient
+from scamshield.metrics import JOB_BATCH_SECONDS, JOB_REPORTS
 
 
 class Command(BaseCommand):
@@ -10,6 +12,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         client = SuiClient()
+        started = time.monotonic()
 
         # Fetch ReportCreated events from the last day
         start_time = (
@@ -40,6 +43,7 @@ class Command(BaseCommand):
                 # Check if we already have this report
                 if ScamReport.objects.filter(sui_object_id=report_id).exists():
                     existing_count += 1
+                    JOB_REPORTS.labels("fetch_reports", "existing").inc()
                     continue
 
                 # Create a new report
@@ -65,6 +69,7 @@ class Command(BaseCommand):
                 )
 
                 new_count += 1
+                JOB_REPORTS.labels("fetch_reports", "created").inc()
                 self.stdout.write(
                     self.style.SUCCESS(f"Successfully imported report {report_id}")
                 )
@@ -74,4 +79,7 @@ class Command(BaseCommand):
             )
 
         except Exception as e:
+            JOB_REPORTS.labels("fetch_reports", "error").inc()
             self.stdout.write(self.style.ERROR(f"Error fetching events: {str(e)}"))
+        finally:
+            JOB_BATCH_SECONDS.labels("fetch_reports").observe(time.monotonic() - started)
@@ -0,0 +1,206 @@
+import hashlib
+import itertools
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Evidence, ScamReport, ScamTactic, TimelineEvent, Verification
+
+SCAM_TYPES = [choice for choice, _ in ScamReport.SCAM_TYPE_CHOICES]
+SCAM_TYPE_WEIGHTS = [8, 10, 6, 4, 9, 5, 14, 7, 2]
+EVIDENCE_TYPES = [choice for choice, _ in Evidence.TYPE_CHOICES]
+TACTICS = (
+    "Promised guaranteed returns on staked tokens",
+    "Impersonated project support in direct messages",
+    "Asked the victim to sign a blind approval transaction",
+    "Advertised a fake airdrop claim page",
+    "Created urgency with a countdown to a token unlock",
+    "Shared a cloned wallet extension download link",
+)
+
+
+def address(kind, index):
+    return "0x" + hashlib.sha256(f"{kind}{index}".encode()).hexdigest()
+
+
+def zipf_weights(count, skew):
+    """
+    Cumulative weights of a Zipf distribution over ``count`` ranks, for
+    ``random.choices``: rank ``k`` is picked in proportion to ``1 / k**skew``.
+    """
+    return list(itertools.accumulate(1 / (k**skew) for k in range(1, count + 1)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset of scam reports with evidence, "
+        "verifications, timeline events and tactics, for benchmarking"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reports", type=int, default=100000)
+        parser.add_argument(
+            "--scammers",
+            type=int,
+            help="Distinct scammer addresses (default: reports / 10)",
+        )
+        parser.add_argument(
+            "--reporters",
+            type=int,
+            help="Distinct reporter addresses (default: reports / 20)",
+        )
+        parser.add_argument("--verifiers", type=int, default=5000)
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of the scammer address distribution",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread creation dates over this many days",
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.now = timezone.now()
+        self.days = options["days"]
+        reports = options["reports"]
+        scammers = options["scammers"] or max(reports // 10, 1)
+        reporters = options["reporters"] or max(reports // 20, 1)
+        self.scammer_weights = zipf_weights(scammers, options["skew"])
+        self.reporter_weights = zipf_weights(reporters, 0.8)
+        self.verifiers = options["verifiers"]
+
+        totals = {}
+        started = time.monotonic()
+        batch_size = options["batch_size"]
+        for offset in range(0, reports, batch_size):
+            counts = self._batch(min(batch_size, reports - offset))
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+            done = offset + counts["reports"]
+            self.stdout.write(
+                f"{done}/{reports} reports ({done / (time.monotonic() - started):.0f}/s)"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Generated "
+                + ", ".join(f"{count} {name}" for name, count in totals.items())
+            )
+        )
+
+    def _batch(self, size):
+        rng = self.rng
+        scammer_ranks = rng.choices(
+            range(len(self.scammer_weights)), cum_weights=self.scammer_weights, k=size
+        )
+        reporter_ranks = rng.choices(
+            range(len(self.reporter_weights)), cum_weights=self.reporter_weights, k=size
+        )
+        scam_types = rng.choices(SCAM_TYPES, weights=SCAM_TYPE_WEIGHTS, k=size)
+
+        reports = []
+        children = {
+            "evidence": [],
+            "verifications": [],
+            "timeline events": [],
+            "tactics": [],
+        }
+        for scammer, reporter, scam_type in zip(
+            scammer_ranks, reporter_ranks, scam_types
+        ):
+            created_at = self.now - timedelta(seconds=rng.uniform(0, self.days * 86400))
+            deadline = created_at + timedelta(days=3)
+            report = ScamReport(
+                title=f"{scam_type.replace('_', ' ').title()} scam",
+                scammer_address=address("scammer", scammer),
+                reporter_address=address("reporter", reporter),
+                scam_type=scam_type,
+                description="Synthetic report generated for benchmarking",
+                transaction_amount=round(rng.lognormvariate(5, 2), 2),
+                risk_level=rng.choice(["low", "medium", "medium", "high"]),
+                created_at=created_at,
+                verification_deadline=deadline,
+                network="testnet",
+                sui_object_id=address("object", rng.getrandbits(64)),
+                stake_amount=rng.randint(1, 20) * 10**9,
+            )
+            reports.append(report)
+            children["timeline events"].append(
+                TimelineEvent(
+                    report_id=report.id, date=created_at, event="Report submitted"
+                )
+            )
+
+            # Most reports get a handful of votes, a few get many
+            votes = min(int(rng.expovariate(1 / 3)), 50, self.verifiers)
+            for verifier in rng.sample(range(self.verifiers), votes):
+                verified = rng.random() < 0.7
+                if verified:
+                    report.verification_count += 1
+                else:
+                    report.rejection_count += 1
+                children["verifications"].append(
+                    Verification(
+                        report_id=report.id,
+                        verifier=address("verifier", verifier),
+                        verified=verified,
+                        comment="",
+                        timestamp=created_at
+                        + timedelta(seconds=rng.uniform(0, 259200)),
+                    )
+                )
+            if deadline < self.now and votes:
+                report.status = (
+                    "verified"
+                    if report.verification_count > report.rejection_count
+                    else "rejected"
+                )
+                children["timeline events"].append(
+                    TimelineEvent(
+                        report_id=report.id,
+                        date=deadline,
+                        event=f"Report {report.status}",
+                    )
+                )
+
+            for _ in range(rng.choice((0, 1, 1, 2, 3))):
+                children["evidence"].append(
+                    Evidence(
+                        report_id=report.id,
+                        type=rng.choice(EVIDENCE_TYPES),
+                        description="Synthetic evidence",
+                        link=f"https://suiscan.xyz/testnet/object/{report.sui_object_id}",
+                        hash=address("evidence", rng.getrandbits(64))[2:],
+                        created_at=created_at,
+                    )
+                )
+            for tactic in rng.sample(TACTICS, rng.choice((0, 1, 1, 2, 3))):
+                children["tactics"].append(
+                    ScamTactic(report_id=report.id, description=tactic)
+                )
+
+        models = {
+            "evidence": Evidence,
+            "verifications": Verification,
+            "timeline events": TimelineEvent,
+            "tactics": ScamTactic,
+        }
+        with transaction.atomic():
+            ScamReport.objects.bulk_create(reports)
+            for name, rows in children.items():
+                models[name].objects.bulk_create(rows, batch_size=2000)
+
+        counts = {"reports": len(reports)}
+        counts.update((name, len(rows)) for name, rows in children.items())
+        return counts
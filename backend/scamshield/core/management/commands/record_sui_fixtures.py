@@ -0,0 +1,53 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from core.sui_service import SuiClient
+
+
+class Command(BaseCommand):
+    help = "Record responses from a real Sui node into a fixture file for sui_standin"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Fixture file to write")
+        parser.add_argument(
+            "--network",
+            default=settings.SUI_DEFAULT_NETWORK,
+            choices=list(settings.SUI_NETWORKS),
+        )
+        parser.add_argument("--digest", action="append", default=[])
+        parser.add_argument("--object", action="append", default=[])
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=0,
+            help="Number of report registry events to record",
+        )
+
+    def handle(self, *args, **options):
+        client = SuiClient(options["network"])
+        fixtures = {"sui_getTransactionBlock": {}, "sui_getObject": {}, "sui_getEvents": []}
+
+        for digest in options["digest"]:
+            fixtures["sui_getTransactionBlock"][digest] = client.get_transaction_block(digest)
+        for object_id in options["object"]:
+            fixtures["sui_getObject"][object_id] = client.get_object(object_id)
+
+        cursor = None
+        while len(fixtures["sui_getEvents"]) < options["events"]:
+            page = client.query_module_events(cursor, 50)
+            fixtures["sui_getEvents"].extend(page.get("data", []))
+            cursor = page.get("nextCursor")
+            if not page.get("hasNextPage"):
+                break
+        del fixtures["sui_getEvents"][options["events"] :]
+
+        with open(options["output"], "w") as f:
+            json.dump(fixtures, f, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recorded {len(fixtures['sui_getTransactionBlock'])} transactions, "
+                f"{len(fixtures['sui_getObject'])} objects and "
+                f"{len(fixtures['sui_getEvents'])} events to {options['output']}"
+            )
+        )
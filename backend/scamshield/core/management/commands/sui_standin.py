@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+from core.sui_standin import StandinNode, load_fixtures, serve, synthetic_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local stand-in Sui JSON-RPC node for benchmarks and tests. "
+        "Point the app at it with SUI_RPC_OVERRIDE=http://<host>:<port>/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=9100)
+        parser.add_argument(
+            "--fixtures",
+            action="append",
+            default=[],
+            help="Recorded fixture file or directory (repeatable)",
+        )
+        parser.add_argument(
+            "--synthetic-events",
+            type=int,
+            default=0,
+            help="Number of synthetic report registry events to generate",
+        )
+        parser.add_argument("--latency-ms", type=float, default=0)
+        parser.add_argument("--jitter-ms", type=float, default=0)
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Fraction of requests answered with HTTP 503",
+        )
+        parser.add_argument(
+            "--rpc-error-rate",
+            type=float,
+            default=0.0,
+            help="Fraction of requests answered with a JSON-RPC error",
+        )
+        parser.add_argument(
+            "--churn",
+            type=float,
+            default=0.0,
+            help="Probability that a synthetic object has a new version on each read",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        fixtures = load_fixtures(options["fixtures"])
+        if options["synthetic_events"]:
+            fixtures["sui_getEvents"].extend(
+                synthetic_events(options["synthetic_events"], seed=options["seed"])
+            )
+
+        node = StandinNode(
+            fixtures,
+            latency_ms=options["latency_ms"],
+            jitter_ms=options["jitter_ms"],
+            error_rate=options["error_rate"],
+            rpc_error_rate=options["rpc_error_rate"],
+            churn=options["churn"],
+            seed=options["seed"],
+        )
+        server = serve(node, options["host"], options["port"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stand-in Sui node listening on http://{options['host']}:{options['port']}/ "
+                f"({len(node.events)} events, "
+                f"{len(fixtures['sui_getTransactionBlock'])} transactions, "
+                f"{len(fixtures['sui_getObject'])} objects recorded)"
+            )
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"Served {node.requests} requests.")
@@ -1,64 +1,143 @@
+import os
+import signal
+import socket
+import threading
+import time
+
 from django.core.management.base import BaseCommand
+from django.db.models import F
 from django.utils import timezone
-from core.models import ScamReport
+from core.leases import claim_reports, release_reports
+from core.models import ScamReport, SyncWorker
 from core.sui_service import sync_verification_status
+from scamshield.metrics import JOB_BATCH_SECONDS, JOB_REPORTS
 
 
 class Command(BaseCommand):
     help = "Sync report statuses with the Sui blockchain"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--worker-id",
+            default=f"{socket.gethostname()}:{os.getpid()}",
+            help="Identifies this worker in leases and throughput metrics",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Reports claimed per lease",
+        )
+        parser.add_argument(
+            "--lease-seconds",
+            type=int,
+            default=300,
+            help="How long a claimed report is reserved; a synced report is not "
+            "picked up again before its lease expires",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep claiming reports instead of exiting when none are left",
+        )
+        parser.add_argument(
+            "--idle-sleep",
+            type=float,
+            default=10.0,
+            help="Seconds to wait in --loop mode when there is nothing to claim",
+        )
+
     def handle(self, *args, **options):
-        # Get all pending reports
+        self.stop = threading.Event()
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGTERM, self._request_stop)
+
+        worker_id = options["worker_id"]
+        SyncWorker.objects.update_or_create(
+            worker_id=worker_id,
+            defaults={
+                "started_at": timezone.now(),
+                "last_seen": timezone.now(),
+                "synced": 0,
+                "errors": 0,
+            },
+        )
+
+        # Pending reports, including those whose verification period has
+        # ended and are waiting to be resolved on-chain
         pending_reports = ScamReport.objects.filter(
             status="pending", sui_object_id__isnull=False
         )
+        if not options["loop"]:
+            # A single pass: skip reports leased since the run started, even
+            # if their lease has already expired again.
+            pending_reports = pending_reports.exclude(
+                lease_expires_at__gte=timezone.now()
+            )
 
         sync_count = 0
         error_count = 0
 
-        for report in pending_reports:
-            success, message = sync_verification_status(report)
-
-            if success:
-                sync_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Successfully synced report {report.id}: {message}"
-                    )
-                )
-            else:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f"Failed to sync report {report.id}: {message}")
-                )
-
-        # Check for reports where verification period has ended
-        expired_reports = ScamReport.objects.filter(
-            status="pending", verification_deadline__lt=timezone.now()
-        )
-
-        for report in expired_reports:
-            # Skip reports without an on-chain ID
-            if not report.sui_object_id:
+        while not self.stop.is_set():
+            batch = claim_reports(
+                pending_reports,
+                worker_id,
+                options["batch_size"],
+                options["lease_seconds"],
+            )
+            if not batch:
+                if not options["loop"]:
+                    break
+                self.stop.wait(options["idle_sleep"])
                 continue
 
-            success, message = sync_verification_status(report)
+            started = time.monotonic()
+            batch_synced = 0
+            batch_errors = 0
+            for index, report in enumerate(batch):
+                if self.stop.is_set():
+                    # Hand the rest of the batch to other workers right away
+                    release_reports(batch[index:], worker_id)
+                    break
+
+                success, message = sync_verification_status(report)
 
-            if success:
-                sync_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Successfully synced expired report {report.id}: {message}"
+                if success:
+                    batch_synced += 1
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Successfully synced report {report.id}: {message}"
+                        )
                     )
-                )
-            else:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(
-                        f"Failed to sync expired report {report.id}: {message}"
+                else:
+                    batch_errors += 1
+                    self.stdout.write(
+                        self.style.ERROR(f"Failed to sync report {report.id}: {message}")
                     )
-                )
 
+            elapsed = time.monotonic() - started
+            JOB_REPORTS.labels("sync_reports", "synced").inc(batch_synced)
+            JOB_REPORTS.labels("sync_reports", "error").inc(batch_errors)
+            JOB_BATCH_SECONDS.labels("sync_reports").observe(elapsed)
+            sync_count += batch_synced
+            error_count += batch_errors
+            SyncWorker.objects.filter(worker_id=worker_id).update(
+                synced=F("synced") + batch_synced,
+                errors=F("errors") + batch_errors,
+                last_seen=timezone.now(),
+            )
+            processed = batch_synced + batch_errors
+            self.stdout.write(
+                f"Worker {worker_id}: {processed} reports in {elapsed:.2f}s "
+                f"({processed / elapsed if elapsed else 0:.1f} reports/s)"
+            )
+
+        worker = SyncWorker.objects.get(worker_id=worker_id)
         self.stdout.write(
-            f"Sync complete. Synced {sync_count} reports with {error_count} errors."
+            f"Sync complete. Synced {sync_count} reports with {error_count} errors "
+            f"({worker.throughput:.1f} reports/s)."
         )
+
+    def _request_stop(self, signum, frame):
+        self.stdout.write("Shutting down after the current report...")
+        self.stop.set()
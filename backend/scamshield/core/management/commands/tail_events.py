@@ -0,0 +1,101 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.events import apply_events
+from core.models import EventCursor
+from core.sui_service import SuiClient
+
+
+class Command(BaseCommand):
+    help = (
+        "Tail ReportCreated, ReportVerified and ReportResolved events and apply "
+        "them to the database as they are emitted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--network",
+            default=settings.SUI_DEFAULT_NETWORK,
+            choices=list(settings.SUI_NETWORKS),
+        )
+        parser.add_argument(
+            "--cursor",
+            help="Name under which the stream position is stored "
+            "(default: <network>:report_registry)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Events fetched and written per batch",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait once the stream is caught up",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the stream is caught up instead of waiting for new events",
+        )
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGTERM, self._request_stop)
+
+        network = options["network"]
+        client = SuiClient(network)
+        cursor, _ = EventCursor.objects.get_or_create(
+            name=options["cursor"] or f"{network}:report_registry"
+        )
+        self.stdout.write(f"Tailing events from {cursor}")
+
+        totals = {}
+        backoff = options["poll_interval"]
+        while not self.stop.is_set():
+            try:
+                page = client.query_module_events(cursor.as_rpc(), options["batch_size"])
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Error fetching events: {str(e)}"))
+                self.stop.wait(backoff)
+                backoff = min(backoff * 2, 60)
+                continue
+            backoff = options["poll_interval"]
+
+            events = page.get("data", [])
+            if events:
+                # The cursor moves in the same transaction as the writes, so a
+                # batch is either fully applied and skipped next time, or not at all.
+                with transaction.atomic():
+                    counts = apply_events(events, network)
+                    cursor.advance(page.get("nextCursor") or events[-1]["id"])
+                for name, count in counts.items():
+                    totals[name] = totals.get(name, 0) + count
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Applied {len(events)} events: "
+                        + ", ".join(f"{name}={count}" for name, count in counts.items())
+                    )
+                )
+
+            if not page.get("hasNextPage"):
+                if options["once"]:
+                    break
+                self.stop.wait(options["poll_interval"])
+
+        self.stdout.write(
+            "Stopped at {}. Totals: {}".format(
+                cursor,
+                ", ".join(f"{name}={count}" for name, count in totals.items()) or "none",
+            )
+        )
+
+    def _request_stop(self, signum, frame):
+        self.stdout.write("Shutting down after the current batch...")
+        self.stop.set()
@@ -0,0 +1,155 @@
+import mimetypes
+import re
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.views import APIView
+
+from core.models import Evidence
+
+BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+VARIANTS = ("thumbnail", "preview")
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range ``Range`` header into inclusive ``(start, end)``.
+
+    Returns None when the header should be ignored (absent, malformed or
+    multi-range) and raises ValueError when the range is unsatisfiable.
+    """
+    match = RANGE_RE.match(header or "")
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def _read_range(file, start, length):
+    with file:
+        file.seek(start)
+        while length > 0:
+            block = file.read(min(BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+class FileNegotiation(BaseContentNegotiation):
+    """
+    Ignores ``Accept``: a browser asking for ``image/*`` still gets the file,
+    and errors are rendered with the first renderer.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class EvidenceFileView(APIView):
+    """
+    Serve an evidence file, or its ``?variant=thumbnail|preview``, to
+    authenticated users like the report it belongs to.
+
+    Supports conditional requests through ETags derived from
+    ``Evidence.hash`` and single byte ranges. With ``EVIDENCE_SENDFILE`` set
+    the bytes are handed off to the web server (X-Sendfile or
+    X-Accel-Redirect) instead of being streamed through Python.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "reports"
+    content_negotiation_class = FileNegotiation
+
+    def get(self, request, pk):
+        evidence = get_object_or_404(Evidence.objects.select_related("blob"), pk=pk)
+
+        variant = request.query_params.get("variant")
+        if variant:
+            if variant not in VARIANTS or not evidence.blob_id:
+                raise Http404("No such variant")
+            file = getattr(evidence.blob, variant)
+        else:
+            file = evidence.file
+        if not file:
+            raise Http404("No file for this evidence")
+
+        etag = None
+        if evidence.hash:
+            etag = f'"{evidence.hash}-{variant}"' if variant else f'"{evidence.hash}"'
+        if etag and etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        content_type = mimetypes.guess_type(file.name)[0] or "application/octet-stream"
+        response = self._serve(request, file, content_type, etag)
+        response["Accept-Ranges"] = "bytes"
+        if etag:
+            response["ETag"] = etag
+            # Content-addressed: the bytes behind this URL never change, but
+            # only authenticated users may see them
+            response["Cache-Control"] = "private, max-age=31536000, immutable"
+        return response
+
+    def _serve(self, request, file, content_type, etag):
+        mode = settings.EVIDENCE_SENDFILE
+        if mode == "x-accel-redirect":
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = settings.EVIDENCE_ACCEL_REDIRECT_PREFIX + file.name
+            return response
+        if mode == "x-sendfile":
+            response = HttpResponse(content_type=content_type)
+            response["X-Sendfile"] = file.path
+            return response
+
+        size = file.size
+        if_range = request.headers.get("If-Range")
+        byte_range = None
+        if not if_range or if_range == etag:
+            try:
+                byte_range = parse_range(request.headers.get("Range"), size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+
+        if byte_range is None:
+            # Full responses go through wsgi.file_wrapper (sendfile) when available
+            return FileResponse(file.open("rb"), content_type=content_type)
+
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _read_range(file.open("rb"), start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return response
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_scamreport_network"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("tx_digest", models.CharField(blank=True, max_length=255, null=True)),
+                ("event_seq", models.CharField(blank=True, max_length=32, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_eventcursor"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackfillRange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("job", models.CharField(max_length=100)),
+                ("start_ms", models.BigIntegerField()),
+                ("end_ms", models.BigIntegerField()),
+                ("completed", models.BooleanField(default=False)),
+                ("event_count", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["start_ms"],
+                "unique_together": {("job", "start_ms")},
+            },
+        ),
+    ]
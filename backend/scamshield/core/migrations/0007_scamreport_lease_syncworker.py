@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_backfillrange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncWorker",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("worker_id", models.CharField(max_length=100, unique=True)),
+                ("started_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("last_seen", models.DateTimeField(default=django.utils.timezone.now)),
+                ("synced", models.IntegerField(default=0)),
+                ("errors", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="scamreport",
+            name="lease_expires_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="scamreport",
+            name="lease_owner",
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+    ]
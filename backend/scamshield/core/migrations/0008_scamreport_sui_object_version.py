@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_scamreport_lease_syncworker"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scamreport",
+            name="sui_object_version",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:32
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_scamreport_sui_object_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EvidenceUpload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("transaction", "Transaction"),
+                            ("screenshot", "Screenshot"),
+                            ("report", "Report"),
+                            ("document", "Document"),
+                            ("video", "Video"),
+                            ("other", "Other"),
+                        ],
+                        default="other",
+                        max_length=20,
+                    ),
+                ),
+                ("description", models.CharField(blank=True, max_length=255)),
+                ("filename", models.CharField(max_length=255)),
+                ("size", models.BigIntegerField(blank=True, null=True)),
+                ("received", models.BigIntegerField(default=0)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "evidence",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="upload",
+                        to="core.evidence",
+                    ),
+                ),
+                (
+                    "report",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="uploads",
+                        to="core.scamreport",
+                    ),
+                ),
+            ],
+        ),
+    ]
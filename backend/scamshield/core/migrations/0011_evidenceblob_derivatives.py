@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_evidenceblob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evidenceblob",
+            name="derivatives_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("ready", "Ready"),
+                    ("unsupported", "Unsupported"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidenceblob",
+            name="preview",
+            field=models.FileField(
+                blank=True, null=True, upload_to="evidence/derived/"
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidenceblob",
+            name="thumbnail",
+            field=models.FileField(
+                blank=True, null=True, upload_to="evidence/derived/"
+            ),
+        ),
+    ]
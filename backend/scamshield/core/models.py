@@ -55,6 +55,7 @@ class ScamReport(models.Model):
     transaction_hash = models.CharField(max_length=255, blank=True, null=True)
     transaction_digest = models.CharField(max_length=255, blank=True, null=True)
     sui_object_id = models.CharField(max_length=255, blank=True, null=True)
+    sui_object_version = models.BigIntegerField(blank=True, null=True)
     network = models.CharField(max_length=25, blank=True, null=True, default="testnet")
     stake_amount = models.BigIntegerField(default=0)
 
@@ -62,6 +63,10 @@ class ScamReport(models.Model):
     verification_count = models.IntegerField(default=0)
     rejection_count = models.IntegerField(default=0)
 
+    # Sync worker lease
+    lease_owner = models.CharField(max_length=100, blank=True, null=True)
+    lease_expires_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
     def __str__(self):
         return f"{self.title} - {self.status}"
 
@@ -69,6 +74,35 @@ class ScamReport(models.Model):
         return timezone.now() > self.verification_deadline
 
 
+class EvidenceBlob(models.Model):
+    """
+    Content-addressed evidence file, shared by every Evidence with the same bytes.
+    """
+
+    DERIVATIVE_STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("ready", "Ready"),
+        ("unsupported", "Unsupported"),
+        ("failed", "Failed"),
+    )
+
+    hash = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(upload_to="evidence/")
+    size = models.BigIntegerField()
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    # Smaller renditions built in the background after upload
+    thumbnail = models.FileField(upload_to="evidence/derived/", blank=True, null=True)
+    preview = models.FileField(upload_to="evidence/derived/", blank=True, null=True)
+    derivatives_status = models.CharField(
+        max_length=20, choices=DERIVATIVE_STATUS_CHOICES, default="pending"
+    )
+
+    def __str__(self):
+        return f"{self.hash[:12]} ({self.ref_count} references)"
+
+
 class Evidence(models.Model):
     TYPE_CHOICES = (
         ("transaction", "Transaction"),
@@ -86,6 +120,13 @@ class Evidence(models.Model):
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     description = models.CharField(max_length=255)
     file = models.FileField(upload_to="evidence/", blank=True, null=True)
+    blob = models.ForeignKey(
+        EvidenceBlob,
+        related_name="evidence",
+        blank=True,
+        null=True,
+        on_delete=models.PROTECT,
+    )
     link = models.URLField(blank=True, null=True)
     hash = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(default=timezone.now)
@@ -94,6 +135,32 @@ class Evidence(models.Model):
         return f"{self.type} evidence for {self.report.title}"
 
 
+class EvidenceUpload(models.Model):
+    """
+    A resumable, chunked upload that becomes an ``Evidence`` once completed.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    report = models.ForeignKey(
+        ScamReport, related_name="uploads", on_delete=models.CASCADE
+    )
+    type = models.CharField(
+        max_length=20, choices=Evidence.TYPE_CHOICES, default="other"
+    )
+    description = models.CharField(max_length=255, blank=True)
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField(blank=True, null=True)
+    received = models.BigIntegerField(default=0)
+    evidence = models.OneToOneField(
+        Evidence, related_name="upload", blank=True, null=True, on_delete=models.SET_NULL
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload of {self.filename} ({self.received} bytes)"
+
+
 class Verification(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     report = models.ForeignKey(
@@ -136,3 +203,68 @@ class TimelineEvent(models.Model):
 
     def __str__(self):
         return f"{self.event} on {self.date.strftime('%Y-%m-%d')}"
+
+
+class EventCursor(models.Model):
+    """
+    Position of an event consumer in the on-chain event stream.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    tx_digest = models.CharField(max_length=255, blank=True, null=True)
+    event_seq = models.CharField(max_length=32, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.tx_digest}:{self.event_seq}"
+
+    def as_rpc(self):
+        if not self.tx_digest:
+            return None
+        return {"txDigest": self.tx_digest, "eventSeq": self.event_seq}
+
+    def advance(self, event_id):
+        self.tx_digest = event_id.get("txDigest")
+        self.event_seq = str(event_id.get("eventSeq"))
+        self.save()
+
+
+class BackfillRange(models.Model):
+    """
+    A slice of event history processed by a backfill job.
+    """
+
+    job = models.CharField(max_length=100)
+    start_ms = models.BigIntegerField()
+    end_ms = models.BigIntegerField()
+    completed = models.BooleanField(default=False)
+    event_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("job", "start_ms")
+        ordering = ["start_ms"]
+
+    def __str__(self):
+        return f"{self.job} [{self.start_ms}, {self.end_ms})"
+
+
+class SyncWorker(models.Model):
+    """
+    Throughput counters of a sync_reports worker for its current run.
+    """
+
+    worker_id = models.CharField(max_length=100, unique=True)
+    started_at = models.DateTimeField(default=timezone.now)
+    last_seen = models.DateTimeField(default=timezone.now)
+    synced = models.IntegerField(default=0)
+    errors = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.worker_id}: {self.synced} synced, {self.errors} errors"
+
+    @property
+    def throughput(self):
+        """Reports processed per second since the run started."""
+        elapsed = (self.last_seen - self.started_at).total_seconds()
+        return (self.synced + self.errors) / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,541 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+import httpx
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+from scamshield.metrics import (
+    RPC_CIRCUIT_FAILURES,
+    RPC_CIRCUIT_STATE,
+    RPC_ERRORS,
+    RPC_LATENCY,
+)
+from scamshield.profiling import record_rpc
+
+
+class SuiRpcError(Exception):
+    """
+    Raised when a Sui JSON-RPC call fails or the node returns an error.
+    """
+
+
+class SuiNodeError(SuiRpcError):
+    """
+    The node answered with a JSON-RPC error (e.g. an unknown digest).
+    """
+
+
+class RpcUnavailable(SuiRpcError):
+    """
+    Raised without calling the node when the guard refuses a call.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket whose refill rate can be changed while in use.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """
+        Take a token if one is available. Returns the seconds to wait
+        for the next token otherwise (0 means the token was taken).
+        """
+        with self.lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    async def aacquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failed or slow calls, fails
+    fast while open, and lets ``half_open_probes`` calls through once
+    ``reset_timeout`` has passed to decide whether to close again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold, reset_timeout, half_open_probes=1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probes_in_flight = 0
+        self.lock = threading.Lock()
+
+    def before_call(self):
+        with self.lock:
+            if self.state == self.OPEN:
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise RpcUnavailable("Sui RPC circuit is open", retry_after=remaining)
+                self.state = self.HALF_OPEN
+                self.probes_in_flight = 0
+            if self.state == self.HALF_OPEN:
+                if self.probes_in_flight >= self.half_open_probes:
+                    raise RpcUnavailable(
+                        "Sui RPC circuit is half-open, probe in progress",
+                        retry_after=self.reset_timeout,
+                    )
+                self.probes_in_flight += 1
+
+    def release_probe(self):
+        """
+        Give back a probe slot taken by a call that never reached the node.
+        """
+        with self.lock:
+            self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.probes_in_flight = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            if (
+                self.state == self.HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.probes_in_flight = 0
+
+
+def rpc_result(response_data):
+    """
+    The ``result`` of a JSON-RPC response body, or the error it stands for.
+    """
+    if not isinstance(response_data, dict):
+        raise SuiRpcError("Sui RPC Error: malformed response")
+    if "error" in response_data:
+        raise SuiNodeError(f"Sui RPC Error: {response_data['error']}")
+    if "result" not in response_data:
+        raise SuiRpcError("Sui RPC Error: response has no result")
+    return response_data["result"]
+
+
+@contextmanager
+def instrumented(network, method):
+    """
+    Time a call for the request profile and the RPC metrics.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except SuiRpcError as e:
+        RPC_ERRORS.labels(network, method, type(e).__name__).inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        record_rpc(elapsed)
+        RPC_LATENCY.labels(network, method).observe(elapsed)
+
+
+# Gauge values of the circuit states, from healthy to failing fast
+CIRCUIT_STATES = (CircuitBreaker.CLOSED, CircuitBreaker.HALF_OPEN, CircuitBreaker.OPEN)
+
+
+class RpcGuard:
+    """
+    Circuit breaker plus an adaptive rate limit in front of one network.
+
+    The limit backs off multiplicatively on failures and slow calls and
+    recovers additively on fast successes, between ``min_rate`` and ``rate``.
+    """
+
+    def __init__(
+        self,
+        rate=20,
+        burst=40,
+        min_rate=1,
+        failure_threshold=5,
+        latency_threshold=3.0,
+        reset_timeout=30,
+        half_open_probes=1,
+        acquire_timeout=1.0,
+        network=None,
+    ):
+        self.network = network
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.latency_threshold = latency_threshold
+        self.acquire_timeout = acquire_timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, half_open_probes)
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.last_latency = None
+
+    def call(self, fn):
+        try:
+            self._before_call()
+            try:
+                if not self.bucket.acquire(self.acquire_timeout):
+                    self._refuse()
+                self.calls += 1
+                started = time.monotonic()
+                try:
+                    result = fn()
+                except SuiRpcError as e:
+                    self._call_failed(e)
+                    raise
+                self._call_succeeded(started)
+                return result
+            except SuiRpcError:
+                raise
+            except BaseException:
+                # Cancelled (say the client went away) or failed in a way
+                # that says nothing about the node: free the probe slot
+                self.breaker.release_probe()
+                raise
+        finally:
+            self._report_state()
+
+    async def acall(self, fn):
+        """
+        Like ``call`` for a coroutine function; waiting for a token does not
+        block the event loop.
+        """
+        try:
+            self._before_call()
+            try:
+                if not await self.bucket.aacquire(self.acquire_timeout):
+                    self._refuse()
+                self.calls += 1
+                started = time.monotonic()
+                try:
+                    result = await fn()
+                except SuiRpcError as e:
+                    self._call_failed(e)
+                    raise
+                self._call_succeeded(started)
+                return result
+            except SuiRpcError:
+                raise
+            except BaseException:
+                # Cancelled (say the client went away) or failed in a way
+                # that says nothing about the node: free the probe slot
+                self.breaker.release_probe()
+                raise
+        finally:
+            self._report_state()
+
+    def _report_state(self):
+        if self.network is None:
+            return
+        RPC_CIRCUIT_STATE.labels(self.network).set(
+            CIRCUIT_STATES.index(self.breaker.state)
+        )
+        RPC_CIRCUIT_FAILURES.labels(self.network).set(
+            self.breaker.consecutive_failures
+        )
+
+    def _before_call(self):
+        try:
+            self.breaker.before_call()
+        except RpcUnavailable:
+            self.rejected += 1
+            raise
+
+    def _refuse(self):
+        self.rejected += 1
+        self.breaker.release_probe()
+        raise RpcUnavailable("Sui RPC rate limit exceeded", retry_after=1)
+
+    def _call_failed(self, e):
+        if isinstance(e, RpcUnavailable):
+            self.rejected += 1
+            self.breaker.release_probe()
+        elif isinstance(e, SuiNodeError):
+            # The node answered; a bad request is not an outage
+            self.breaker.record_success()
+        else:
+            self._failed()
+
+    def _call_succeeded(self, started):
+        latency = time.monotonic() - started
+        self.last_latency = latency
+        if latency > self.latency_threshold:
+            self.slow_calls += 1
+            self._failed()
+        else:
+            self.breaker.record_success()
+            self.bucket.rate = min(self.max_rate, self.bucket.rate + 1)
+
+    def _failed(self):
+        self.failures += 1
+        self.breaker.record_failure()
+        self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+
+    def snapshot(self):
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "rate_limit": round(self.bucket.rate, 2),
+            "calls": self.calls,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "rejected": self.rejected,
+            "last_latency": self.last_latency,
+        }
+
+
+class NetworkPool:
+    """
+    Connection pool, concurrency limit and cache namespace of one Sui network.
+    """
+
+    def __init__(
+        self,
+        network,
+        endpoint,
+        pool_size=10,
+        max_concurrency=8,
+        async_max_concurrency=50,
+        guard=None,
+    ):
+        self.network = network
+        self.endpoint = endpoint
+        self.cache_prefix = f"sui:{network}:"
+        self.async_max_concurrency = async_max_concurrency
+
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "application/json"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.guard = RpcGuard(
+            **{**settings.SUI_RPC_GUARD, **(guard or {})}, network=network
+        )
+
+    def call(self, method, params=None):
+        """
+        Make a JSON-RPC request to the network's node and return its result.
+
+        Raises ``RpcUnavailable`` without contacting the node while the
+        network's circuit is open or its rate limit is exhausted.
+        """
+        with instrumented(self.network, method):
+            return self.guard.call(lambda: self._call(method, params))
+
+    def _call(self, method, params=None):
+        if params is None:
+            params = []
+
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+
+        # Waiting for a slot is bounded so that a slow network makes its own
+        # callers fail instead of piling up threads.
+        if not self.slots.acquire(timeout=settings.SUI_RPC_TIMEOUT):
+            raise RpcUnavailable(
+                f"Sui RPC Error: too many requests in flight to {self.network}",
+                retry_after=1,
+            )
+        try:
+            response = self.session.post(
+                self.endpoint, data=json.dumps(payload), timeout=settings.SUI_RPC_TIMEOUT
+            )
+            # Anything but a 2xx is an outage, even with a JSON body
+            if not response.ok:
+                raise SuiRpcError(f"Sui RPC Error: HTTP {response.status_code}")
+            response_data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise SuiRpcError(f"Sui RPC Error: {str(e)}") from e
+        finally:
+            self.slots.release()
+
+        return rpc_result(response_data)
+
+    def cache_key(self, method, params):
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True).encode()
+        ).hexdigest()
+        return f"{self.cache_prefix}{method}:{digest}"
+
+    def cached_call(self, method, params, timeout=None):
+        """
+        Like ``call``, for results that never change once they exist
+        (e.g. finalized transaction blocks).
+        """
+        key = self.cache_key(method, params)
+        result = cache.get(key)
+        if result is None:
+            result = self.call(method, params)
+            cache.set(key, result, timeout or settings.SUI_RPC_CACHE_TIMEOUT)
+        return result
+
+
+class AsyncNetworkPool:
+    """
+    asyncio counterpart of ``NetworkPool`` for async views.
+
+    Requests go through an ``httpx.AsyncClient`` and are limited to
+    ``async_max_concurrency`` in flight per event loop. The guard and cache
+    namespace are those of the sync pool, so both see the same network health.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.network = pool.network
+        self.endpoint = pool.endpoint
+        self.guard = pool.guard
+        # Clients and semaphores belong to the loop they were created on
+        self._loops = weakref.WeakKeyDictionary()
+
+    def _loop_state(self):
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            limit = self.pool.async_max_concurrency
+            client = httpx.AsyncClient(
+                headers={"Content-Type": "application/json"},
+                timeout=settings.SUI_RPC_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=limit, max_keepalive_connections=limit
+                ),
+            )
+            state = (client, asyncio.Semaphore(limit))
+            self._loops[loop] = state
+        return state
+
+    async def call(self, method, params=None):
+        with instrumented(self.network, method):
+            return await self.guard.acall(lambda: self._call(method, params))
+
+    async def _call(self, method, params=None):
+        if params is None:
+            params = []
+
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+
+        client, slots = self._loop_state()
+        try:
+            await asyncio.wait_for(slots.acquire(), settings.SUI_RPC_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise RpcUnavailable(
+                f"Sui RPC Error: too many requests in flight to {self.network}",
+                retry_after=1,
+            )
+        try:
+            response = await client.post(self.endpoint, content=json.dumps(payload))
+            # Anything but a 2xx is an outage, even with a JSON body
+            if not response.is_success:
+                raise SuiRpcError(f"Sui RPC Error: HTTP {response.status_code}")
+            response_data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise SuiRpcError(f"Sui RPC Error: {str(e) or type(e).__name__}") from e
+        finally:
+            slots.release()
+
+        return rpc_result(response_data)
+
+    async def cached_call(self, method, params, timeout=None):
+        key = self.pool.cache_key(method, params)
+        result = await cache.aget(key)
+        if result is None:
+            result = await self.call(method, params)
+            await cache.aset(key, result, timeout or settings.SUI_RPC_CACHE_TIMEOUT)
+        return result
+
+
+class RpcRouter:
+    """
+    Hands out one ``NetworkPool`` per network configured in ``SUI_NETWORKS``.
+    """
+
+    def __init__(self):
+        self._pools = {}
+        self._async_pools = {}
+        self._lock = threading.Lock()
+
+    def pool(self, network=None):
+        network = network or settings.SUI_DEFAULT_NETWORK
+        pool = self._pools.get(network)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(network)
+                if pool is None:
+                    config = settings.SUI_NETWORKS.get(network)
+                    if config is None:
+                        raise SuiRpcError(f"Unknown Sui network: {network}")
+                    if settings.SUI_RPC_OVERRIDE:
+                        config = {**config, "endpoint": settings.SUI_RPC_OVERRIDE}
+                    pool = NetworkPool(network, **config)
+                    self._pools[network] = pool
+        return pool
+
+    def async_pool(self, network=None):
+        pool = self.pool(network)
+        async_pool = self._async_pools.get(pool.network)
+        if async_pool is None:
+            with self._lock:
+                async_pool = self._async_pools.setdefault(
+                    pool.network, AsyncNetworkPool(pool)
+                )
+        return async_pool
+
+    def snapshot(self):
+        """
+        Guard state of every network that has been used in this process.
+        """
+        return {network: pool.guard.snapshot() for network, pool in self._pools.items()}
+
+
+router = RpcRouter()
@@ -1,14 +1,92 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework import serializers
-from core.models import ScamReport, Evidence, Verification, ScamTactic, TimelineEvent
+from core.models import (
+    ScamReport,
+    Evidence,
+    EvidenceUpload,
+    Verification,
+    ScamTactic,
+    TimelineEvent,
+)
+from core.evidence import create_evidence
+from core.fieldsets import SparseFieldsetMixin
 from core.utils import verify_sui_transaction
 
 
 class EvidenceSerializer(serializers.ModelSerializer):
+    url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+
     class Meta:
         model = Evidence
-        fields = ["id", "type", "description", "file", "link", "hash", "created_at"]
+        fields = [
+            "id",
+            "type",
+            "description",
+            "file",
+            "link",
+            "hash",
+            "url",
+            "thumbnail_url",
+            "preview_url",
+            "created_at",
+        ]
+        read_only_fields = ["hash"]
+
+    def _file_url(self, obj, variant=None):
+        url = reverse("evidence-file", args=[obj.id])
+        if variant:
+            url += f"?variant={variant}"
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+    def _derivative_url(self, obj, name):
+        file = getattr(obj.blob, name, None) if obj.blob_id else None
+        return self._file_url(obj, name) if file else None
+
+    def get_url(self, obj):
+        return self._file_url(obj) if obj.file else None
+
+    def get_thumbnail_url(self, obj):
+        return self._derivative_url(obj, "thumbnail")
+
+    def get_preview_url(self, obj):
+        return self._derivative_url(obj, "preview")
+
+    def create(self, validated_data):
+        file = validated_data.pop("file", None)
+        if file is None:
+            return super().create(validated_data)
+        return create_evidence(file=file, **validated_data)
+
+
+class EvidenceUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EvidenceUpload
+        fields = [
+            "id",
+            "type",
+            "description",
+            "filename",
+            "size",
+            "received",
+            "evidence",
+            "created_at",
+        ]
+        read_only_fields = ["received", "evidence", "created_at"]
+
+    def validate_size(self, value):
+        if value is not None and not 0 < value <= settings.EVIDENCE_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Size must be between 1 and {settings.EVIDENCE_UPLOAD_MAX_SIZE} bytes"
+            )
+        return value
 
 
 class VerificationSerializer(serializers.ModelSerializer):
@@ -36,7 +114,7 @@ class TimelineEventSerializer(serializers.ModelSerializer):
         fields = ["id", "date", "event"]
 
 
-class ScamReportListSerializer(serializers.ModelSerializer):
+class ScamReportListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ScamReport
         fields = [
@@ -59,7 +137,7 @@ class ScamReportListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ScamReportDetailSerializer(serializers.ModelSerializer):
+class ScamReportDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     evidence = EvidenceSerializer(many=True, read_only=True)
     verifications = VerificationSerializer(many=True, read_only=True)
     scam_tactics = ScamTacticSerializer(many=True, read_only=True)
@@ -102,11 +180,15 @@ class ScamReportDetailSerializer(serializers.ModelSerializer):
         if not user or not user.is_authenticated:
             return False
 
-        # Check if this user has already verified this specific report
-        has_verified = Verification.objects.filter(verifier=user, report=obj).exists()
+        wallet_address = getattr(user, "wallet_address", None)
+        # Check if this user has already verified this specific report, using
+        # the verifications prefetched for the response
+        has_verified = any(
+            verification.verifier == wallet_address
+            for verification in obj.verifications.all()
+        )
         # User cannot verify their own report
-        is_reporter = obj.reporter_address == getattr(user, "wallet_address", None)
-        print(f"HAs he verified: {has_verified} is he the reporter: {is_reporter} ")
+        is_reporter = obj.reporter_address == wallet_address
 
         return not has_verified and not is_reporter
 
@@ -136,8 +218,14 @@ class ScamReportCreateSerializer(serializers.ModelSerializer):
             "sui_object_id",
             "stake_amount",
             "transaction_amount",
+            "network",
         ]
 
+    def validate_network(self, value):
+        if value and value not in settings.SUI_NETWORKS:
+            raise serializers.ValidationError(f"Unknown network: {value}")
+        return value
+
     def create(self, validated_data):
         evidence_files = validated_data.pop("evidence_files", [])
         transaction_digest = validated_data.get("transaction_digest", "")
@@ -153,18 +241,19 @@ class ScamReportCreateSerializer(serializers.ModelSerializer):
 
         # Create evidence entries
         for file in evidence_files:
-            Evidence.objects.create(
-                report=report,
+            create_evidence(
+                report,
+                file,
                 type="screenshot",  # Default, can be updated later
-                description=f"Evidence file: {file.name}",
-                file=file,
             )
 
         # Create initial timeline event
         TimelineEvent.objects.create(
             report=report, date=timezone.now(), event="Report submitted to ScamShield"
         )
-        verify_sui_transaction(tx_digest=transaction_digest, report_id=report.id)
+        verify_sui_transaction(
+            tx_digest=transaction_digest, report_id=report.id, network=report.network
+        )
 
         return report
 
@@ -181,21 +270,26 @@ class VerificationCreateSerializer(serializers.ModelSerializer):
         validated_data["verifier"] = self.context["request"].user.wallet_address
         validated_data["report"] = report
 
-        verification = Verification.objects.create(**validated_data)
+        # One short transaction, and counters updated in SQL rather than by
+        # saving the whole report, so concurrent verifications don't collide
+        with transaction.atomic():
+            verification = Verification.objects.create(**validated_data)
 
-        # Update report verification/rejection counts
-        if verification.verified:
-            report.verification_count += 1
-        else:
-            report.rejection_count += 1
-        report.save()
+            # Update report verification/rejection counts
+            counter = (
+                "verification_count" if verification.verified else "rejection_count"
+            )
+            ScamReport.objects.filter(pk=report.pk).update(
+                **{counter: F(counter) + 1}
+            )
+            setattr(report, counter, getattr(report, counter) + 1)
 
-        # Add timeline event
-        TimelineEvent.objects.create(
-            report=report,
-            date=timezone.now(),
-            event=f"{'Verified' if verification.verified else 'Rejected'} by {verification.verifier[:10]}...",
-        )
+            # Add timeline event
+            TimelineEvent.objects.create(
+                report=report,
+                date=timezone.now(),
+                event=f"{'Verified' if verification.verified else 'Rejected'} by {verification.verifier[:10]}...",
+            )
 
         return verification
 
@@ -203,3 +297,6 @@ class VerificationCreateSerializer(serializers.ModelSerializer):
 class VerifyTransactionSerializer(serializers.Serializer):
     transaction_hash = serializers.CharField(max_length=255)
     report = serializers.CharField(max_length=255)
+    network = serializers.ChoiceField(
+        choices=ScamReport.NETWORK_CHOICES, required=False
+    )
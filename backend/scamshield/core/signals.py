@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from core.evidence import release_blob
+from core.models import Evidence
+
+
+@receiver(post_delete, sender=Evidence)
+def release_evidence_blob(sender, instance, **kwargs):
+    if instance.blob_id:
+        release_blob(instance.blob_id)
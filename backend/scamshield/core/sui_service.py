@@ -1,8 +1,24 @@
 from django.conf import settings
-import requests
-import json
 from datetime import datetime, timedelta
 from django.utils import timezone
+from core.rpc import router
+
+# Values of the on-chain ``ReportStatus`` struct.
+ON_CHAIN_STATUS = {
+    0: "pending",
+    1: "verified",
+    2: "rejected",
+}
+
+REPORT_MODULE = "report_registry"
+
+TRANSACTION_BLOCK_OPTIONS = {
+    "showInput": True,
+    "showEffects": True,
+    "showEvents": True,
+    "showObjectChanges": True,
+    "showBalanceChanges": True,
+}
 
 
 class SuiClient:
@@ -10,31 +26,16 @@ class SuiClient:
     Client for interacting with the Sui blockchain.
     """
 
-    def __init__(self):
-        self.endpoint = settings.SUI_RPC_ENDPOINT
-        self.headers = {
-            "Content-Type": "application/json",
-        }
+    def __init__(self, network=None):
+        self.pool = router.pool(network)
+        self.network = self.pool.network
+        self.endpoint = self.pool.endpoint
 
     def _make_request(self, method, params=None):
         """
         Make a JSON-RPC request to the Sui node.
         """
-        if params is None:
-            params = []
-
-        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
-
-        response = requests.post(
-            self.endpoint, headers=self.headers, data=json.dumps(payload)
-        )
-
-        response_data = response.json()
-
-        if "error" in response_data:
-            raise Exception(f"Sui RPC Error: {response_data['error']}")
-
-        return response_data["result"]
+        return self.pool.call(method, params)
 
     def get_transaction(self, tx_digest):
         """
@@ -42,6 +43,17 @@ class SuiClient:
         """
         return self._make_request("sui_getTransaction", [tx_digest])
 
+    def get_transaction_block(self, tx_digest):
+        """
+        Get a transaction block with its effects, events and object changes.
+
+        Successful lookups are cached in the network's namespace, since a
+        finalized transaction never changes.
+        """
+        return self.pool.cached_call(
+            "sui_getTransactionBlock", [tx_digest, TRANSACTION_BLOCK_OPTIONS]
+        )
+
     def get_object(self, object_id):
         """
         Get object details.
@@ -69,6 +81,71 @@ class SuiClient:
             "sui_getEvents", [query, None, 100]  # Cursor  # Limit
         )
 
+    def query_events(self, query, cursor=None, limit=50, descending=False):
+        """
+        Get one page of events matching ``query``, starting after ``cursor``.
+
+        Returns the raw page: ``{"data": [...], "nextCursor": ..., "hasNextPage": ...}``.
+        """
+        return self._make_request("sui_getEvents", [query, cursor, limit, descending])
+
+    def query_module_events(self, cursor=None, limit=50):
+        """
+        Get one page of all events emitted by the report registry module,
+        oldest first.
+
+        Nodes don't accept a module filter combined with a time range; use
+        ``query_module_events_between`` for a time range.
+        """
+        query = {
+            "MoveEventModule": {
+                "package": settings.SUI_PACKAGE_ID,
+                "module": REPORT_MODULE,
+            }
+        }
+        return self.query_events(query, cursor, limit)
+
+    def query_module_events_between(self, start_ms, end_ms, cursor=None, limit=50):
+        """
+        Get one page of the events emitted in ``[start_ms, end_ms)``, keeping
+        only the report registry module's.
+
+        The node pages through every event of the range, so a page may come
+        back with fewer than ``limit`` (or no) module events; keep following
+        ``nextCursor`` while ``hasNextPage`` is set.
+        """
+        query = {"TimeRange": {"startTime": str(start_ms), "endTime": str(end_ms)}}
+        page = self.query_events(query, cursor, limit)
+        prefix = f"{settings.SUI_PACKAGE_ID}::{REPORT_MODULE}::"
+        return {
+            **page,
+            "data": [
+                event
+                for event in page.get("data", [])
+                if (event.get("type") or "").startswith(prefix)
+            ],
+        }
+
+
+class AsyncSuiClient:
+    """
+    Async counterpart of ``SuiClient`` for the calls made from async views.
+    """
+
+    def __init__(self, network=None):
+        self.pool = router.async_pool(network)
+        self.network = self.pool.network
+        self.endpoint = self.pool.endpoint
+
+    async def get_transaction_block(self, tx_digest):
+        """
+        Get a transaction block with its effects, events and object changes,
+        sharing ``SuiClient``'s cache.
+        """
+        return await self.pool.cached_call(
+            "sui_getTransactionBlock", [tx_digest, TRANSACTION_BLOCK_OPTIONS]
+        )
+
 
 def verify_report_on_chain(report_id, sui_object_id):
     """
@@ -98,14 +175,26 @@ def verify_report_on_chain(report_id, sui_object_id):
         return False, f"Error verifying report: {str(e)}"
 
 
+def object_version(obj):
+    """
+    Version of an object returned by ``sui_getObject``, or None if absent.
+    """
+    details = obj.get("details", {})
+    version = details.get("reference", {}).get("version", details.get("version"))
+    return int(version) if version is not None else None
+
+
 def sync_verification_status(report):
     """
     Sync verification status from the blockchain to the database.
+
+    Objects whose version has not moved since the last sync are skipped, and
+    only the columns that actually changed are written.
     """
     if not report.sui_object_id:
         return False, "No Sui object ID provided"
 
-    client = SuiClient()
+    client = SuiClient(report.network)
 
     try:
         obj = client.get_object(report.sui_object_id)
@@ -113,28 +202,39 @@ def sync_verification_status(report):
         if obj.get("status") != "Exists":
             return False, "Object does not exist on-chain"
 
+        version = object_version(obj)
+        if (
+            version is not None
+            and report.sui_object_version is not None
+            and version <= report.sui_object_version
+        ):
+            return True, "Report unchanged on-chain"
+
         # Extract verification data from the object
         fields = obj.get("details", {}).get("data", {}).get("fields", {})
 
         if "status" in fields:
             status_value = fields["status"].get("fields", {}).get("value", 0)
+            on_chain = {"sui_object_version": version}
 
             # Update status based on on-chain data
-            if status_value == 0:  # pending
-                report.status = "pending"
-            elif status_value == 1:  # verified
-                report.status = "verified"
-            elif status_value == 2:  # rejected
-                report.status = "rejected"
+            if status_value in ON_CHAIN_STATUS:
+                on_chain["status"] = ON_CHAIN_STATUS[status_value]
 
             # Update verification counts
             if "verification_count" in fields:
-                report.verification_count = int(fields["verification_count"])
+                on_chain["verification_count"] = int(fields["verification_count"])
 
             if "rejection_count" in fields:
-                report.rejection_count = int(fields["rejection_count"])
-
-            report.save()
+                on_chain["rejection_count"] = int(fields["rejection_count"])
+
+            update_fields = []
+            for field, value in on_chain.items():
+                if getattr(report, field) != value:
+                    setattr(report, field, value)
+                    update_fields.append(field)
+            if update_fields:
+                report.save(update_fields=update_fields)
 
             return True, "Report status synced from blockchain"
 
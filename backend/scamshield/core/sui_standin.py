@@ -0,0 +1,320 @@
+"""
+Local stand-in for a Sui fullnode's JSON-RPC API.
+
+Serves ``sui_getTransactionBlock``, ``sui_getObject`` and ``sui_getEvents``
+from recorded fixtures, falling back to deterministic synthetic data, with
+configurable latency and error injection. Point the app at it with
+``SUI_RPC_OVERRIDE=http://127.0.0.1:<port>/``.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from django.conf import settings
+
+from core.sui_service import REPORT_MODULE
+
+SCAM_TYPES = ("phishing", "wallet", "fake_token", "airdrop", "impersonation")
+
+
+def _hex(seed, length=64):
+    return "0x" + hashlib.sha256(seed.encode()).hexdigest()[:length]
+
+
+def load_fixtures(paths):
+    """
+    Merge fixture files of the form
+    ``{"sui_getTransactionBlock": {digest: result}, "sui_getObject": {id: result},
+    "sui_getEvents": [event, ...]}``.
+    """
+    fixtures = {"sui_getTransactionBlock": {}, "sui_getObject": {}, "sui_getEvents": []}
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+        for file in files:
+            data = json.loads(file.read_text())
+            fixtures["sui_getTransactionBlock"].update(data.get("sui_getTransactionBlock", {}))
+            fixtures["sui_getObject"].update(data.get("sui_getObject", {}))
+            fixtures["sui_getEvents"].extend(data.get("sui_getEvents", []))
+    return fixtures
+
+
+def synthetic_events(count, days=90, seed=0):
+    """
+    Generate ``count`` report registry events spread over the last ``days``.
+
+    Roughly a third are ReportCreated; the rest verify or resolve reports
+    created earlier in the stream.
+    """
+    rng = random.Random(seed)
+    package = settings.SUI_PACKAGE_ID
+    now_ms = int(time.time() * 1000)
+    start_ms = now_ms - days * 24 * 3600 * 1000
+    timestamps = sorted(rng.randint(start_ms, now_ms) for _ in range(count))
+
+    events = []
+    open_reports = []
+    for index, timestamp in enumerate(timestamps):
+        fields = None
+        if not open_reports or rng.random() < 0.35:
+            name = "ReportCreated"
+            report_id = _hex(f"report{index}")
+            open_reports.append([report_id, 0, 0])
+            fields = {
+                "report_id": report_id,
+                "scammer_address": _hex(f"scammer{int(rng.paretovariate(1.2)) % 500}"),
+                "reporter_address": _hex(f"reporter{rng.randint(0, 2000)}"),
+                "scam_type": rng.choice(SCAM_TYPES),
+                "stake_amount": str(rng.randint(1, 20) * 10**9),
+                "created_at": str(timestamp),
+                "verification_deadline": str(timestamp + 259200000),
+            }
+        else:
+            report = rng.choice(open_reports)
+            if rng.random() < 0.8:
+                name = "ReportVerified"
+                verified = rng.random() < 0.7
+                report[1 if verified else 2] += 1
+                fields = {
+                    "report_id": report[0],
+                    "verifier": _hex(f"verifier{index}"),
+                    "verified": verified,
+                    "timestamp": str(timestamp),
+                }
+            else:
+                name = "ReportResolved"
+                open_reports.remove(report)
+                fields = {
+                    "report_id": report[0],
+                    "status": {"value": 1 if report[1] > report[2] else 2},
+                    "verification_count": str(report[1]),
+                    "rejection_count": str(report[2]),
+                }
+        events.append(
+            {
+                "id": {"txDigest": _hex(f"tx{index}", 44), "eventSeq": "0"},
+                "packageId": package,
+                "transactionModule": REPORT_MODULE,
+                "type": f"{package}::{REPORT_MODULE}::{name}",
+                "parsedJson": fields,
+                "timestampMs": str(timestamp),
+            }
+        )
+    return events
+
+
+def synthetic_transaction_block(digest):
+    return {
+        "digest": digest,
+        "transaction": {
+            "data": {
+                "sender": _hex(f"sender{digest}"),
+                "transaction": {"inputs": []},
+            }
+        },
+        "effects": {"status": {"status": "success"}},
+        "events": [],
+        "objectChanges": [
+            {
+                "type": "created",
+                "objectId": _hex(f"object{digest}"),
+                "objectType": f"{settings.SUI_PACKAGE_ID}::{REPORT_MODULE}::Report",
+                "version": "1",
+            }
+        ],
+        "balanceChanges": [],
+    }
+
+
+def synthetic_object(object_id, version):
+    return {
+        "status": "Exists",
+        "details": {
+            "data": {
+                "type": f"{settings.SUI_PACKAGE_ID}::{REPORT_MODULE}::Report",
+                "fields": {
+                    "status": {"fields": {"value": 0}},
+                    "verification_count": str(version - 1),
+                    "rejection_count": "0",
+                },
+            },
+            "reference": {
+                "objectId": object_id,
+                "version": version,
+                "digest": _hex(f"{object_id}:{version}", 44),
+            },
+        },
+    }
+
+
+def _matches(event, query):
+    if not query:
+        return True
+    if "MoveEventType" in query:
+        return event.get("type") == query["MoveEventType"]
+    if "MoveEventModule" in query:
+        module = query["MoveEventModule"]
+        return event.get("type", "").startswith(
+            f"{module.get('package')}::{module.get('module')}::"
+        )
+    if "Sender" in query:
+        return query["Sender"] is None or event.get("sender") == query["Sender"]
+    if "TimeRange" in query:
+        start = int(query["TimeRange"]["startTime"])
+        end = int(query["TimeRange"]["endTime"])
+        return start <= int(event.get("timestampMs", 0)) < end
+    return True
+
+
+class StandinNode:
+    """
+    State and behaviour of the stand-in node, independent of HTTP.
+    """
+
+    def __init__(
+        self,
+        fixtures=None,
+        latency_ms=0,
+        jitter_ms=0,
+        error_rate=0.0,
+        rpc_error_rate=0.0,
+        churn=0.0,
+        seed=0,
+    ):
+        self.fixtures = fixtures or load_fixtures([])
+        self.events = sorted(
+            self.fixtures["sui_getEvents"], key=lambda e: int(e.get("timestampMs", 0))
+        )
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rpc_error_rate = rpc_error_rate
+        self.churn = churn
+        self.rng = random.Random(seed)
+        self.versions = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def delay(self):
+        latency = self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+    def inject_http_error(self):
+        return self.error_rate and self.rng.random() < self.error_rate
+
+    def handle(self, request):
+        """
+        Answer one JSON-RPC request object.
+        """
+        with self.lock:
+            self.requests += 1
+        method = request.get("method")
+        params = request.get("params") or []
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+
+        if self.rpc_error_rate and self.rng.random() < self.rpc_error_rate:
+            response["error"] = {"code": -32603, "message": "Injected error"}
+            return response
+
+        handler = getattr(self, method, None)
+        if handler is None or method.startswith("_"):
+            response["error"] = {"code": -32601, "message": f"Method not found: {method}"}
+            return response
+        try:
+            response["result"] = handler(*params)
+        except (LookupError, ValueError) as e:
+            response["error"] = {"code": -32602, "message": str(e)}
+        return response
+
+    def sui_getTransactionBlock(self, digest, options=None):
+        recorded = self.fixtures["sui_getTransactionBlock"].get(digest)
+        return recorded or synthetic_transaction_block(digest)
+
+    def sui_getObject(self, object_id, options=None):
+        recorded = self.fixtures["sui_getObject"].get(object_id)
+        if recorded:
+            return recorded
+        with self.lock:
+            version = self.versions.get(object_id, 1)
+            if self.churn and self.rng.random() < self.churn:
+                version += 1
+            self.versions[object_id] = version
+        return synthetic_object(object_id, version)
+
+    def sui_getEvents(self, query=None, cursor=None, limit=50, descending=False):
+        if query and set(query) & {"All", "Any", "And", "Or"}:
+            # Like a fullnode: filters cannot be combined
+            raise ValueError("Compound event filters are not supported")
+        events = [e for e in self.events if _matches(e, query)]
+        if descending:
+            events.reverse()
+        start = 0
+        if cursor:
+            for index, event in enumerate(events):
+                if event["id"] == cursor:
+                    start = index + 1
+                    break
+            else:
+                raise LookupError("Unknown cursor")
+        limit = int(limit or 50)
+        page = events[start : start + limit]
+        has_next = start + limit < len(events)
+        return {
+            "data": page,
+            "nextCursor": page[-1]["id"] if page else cursor,
+            "hasNextPage": has_next,
+        }
+
+
+def make_handler(node):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            node.delay()
+            if node.inject_http_error():
+                self._send(503, b'{"message": "Injected outage"}')
+                return
+            try:
+                request = json.loads(body)
+            except ValueError:
+                self._send(400, b'{"message": "Invalid JSON"}')
+                return
+            if isinstance(request, list):
+                payload = [node.handle(item) for item in request]
+            else:
+                payload = node.handle(request)
+            self._send(200, json.dumps(payload).encode())
+
+        def _send(self, code, body):
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Async clients open many connections at once; the default backlog of 5
+    # turns a burst into connection resets
+    request_queue_size = 1024
+
+
+def serve(node, host="127.0.0.1", port=9100):
+    """
+    Create a threaded HTTP server for ``node``; call ``serve_forever()`` on it.
+    """
+    return StandinServer((host, port), make_handler(node))
@@ -1,3 +1,696 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import io
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from authy.models import Merchant, User
+from core.management.commands import backfill_events
+from core.evidence import (
+    UploadAlreadyCompleted,
+    UploadOffsetMismatch,
+    append_chunk,
+    complete_upload,
+    create_evidence,
+    partial_path,
+)
+from core.media import parse_range
+from core.models import (
+    BackfillRange,
+    Evidence,
+    EvidenceBlob,
+    EvidenceUpload,
+    ScamReport,
+)
+from core.rpc import NetworkPool, RpcGuard, RpcUnavailable, SuiRpcError
+from core.sui_service import SuiClient
+from core.sui_standin import StandinNode, load_fixtures, serve, synthetic_events
+from scamshield.authentication import merchant_keys, wallet_users
+from scamshield.compression import choose_encoding
+
+
+class QueryBudgetMixin:
+    """
+    ``assertMaxQueries`` fails with every SQL statement listed when the block
+    runs more queries than its budget.
+    """
+
+    @contextmanager
+    def assertMaxQueries(self, budget):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        if len(context) > budget:
+            queries = "\n".join(
+                f"{number}. {query['sql']}"
+                for number, query in enumerate(context.captured_queries, 1)
+            )
+            self.fail(f"{len(context)} queries, budget is {budget}:\n{queries}")
+
+
+def make_report(reporter="0x" + "ab" * 32):
+    return ScamReport.objects.create(
+        title="Fake airdrop",
+        scammer_address="0x" + "ef" * 32,
+        reporter_address=reporter,
+        scam_type="airdrop",
+        description="Claim page drained the wallet",
+        verification_deadline=timezone.now() + timedelta(days=3),
+    )
+
+
+class TemporaryMediaMixin:
+    """
+    Points MEDIA_ROOT and the upload directory at a throwaway directory.
+    """
+
+    def setUp(self):
+        super().setUp()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        settings = override_settings(
+            MEDIA_ROOT=media, EVIDENCE_UPLOAD_DIR=f"{media}/uploads"
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+
+class EndpointQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Query budgets of each endpoint, against a generated dataset so that an
+    N+1 shows up as a budget overrun rather than going unnoticed.
+
+    Budgets include the user lookup of the wallet authentication.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("generate_dataset", reports=300, verifiers=50, stdout=StringIO())
+        # The report with the most children, and its reporter
+        cls.report = (
+            ScamReport.objects.annotate(children=Count("verifications"))
+            .order_by("-children")
+            .first()
+        )
+        cls.wallet = cls.report.reporter_address
+        cls.verifier = cls.report.verifications.first().verifier
+        cls.newcomer = "0x" + "cd" * 32
+        for wallet in (cls.wallet, cls.verifier, cls.newcomer):
+            User.objects.create(wallet_address=wallet)
+
+    def setUp(self):
+        wallet_users.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_WALLET_ADDRESS=self.wallet)
+
+    def get(self, url, budget, **kwargs):
+        with self.assertMaxQueries(budget):
+            response = self.client.get(url, **kwargs)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_reports_list(self):
+        response = self.get("/reports/?page_size=100", 3)
+        self.assertEqual(len(response.data["results"]), 100)
+
+    def test_reports_list_filtered(self):
+        self.get("/reports/?status=verified&scam_type=phishing&search=scam", 3)
+
+    def test_report_detail(self):
+        response = self.get(f"/reports/{self.report.id}/", 6)
+        self.assertGreater(len(response.data["verifications"]), 1)
+        self.assertFalse(response.data["user_can_verify"])
+
+    def test_report_detail_for_verifier(self):
+        self.client.credentials(HTTP_X_WALLET_ADDRESS=self.verifier)
+        response = self.get(f"/reports/{self.report.id}/", 6)
+        self.assertFalse(response.data["user_can_verify"])
+
+    def test_reports_list_sparse_fieldset(self):
+        with self.assertMaxQueries(3) as queries:
+            response = self.client.get("/reports/?fields=title,status,bogus")
+        self.assertEqual(set(response.data["results"][0]), {"id", "title", "status"})
+        page = queries.captured_queries[-1]["sql"]
+        self.assertIn('"title"', page)
+        self.assertNotIn('"description"', page)
+        self.assertNotIn('"additional_details"', page)
+
+    def test_report_detail_sparse_fieldset(self):
+        with self.assertMaxQueries(3) as queries:
+            response = self.client.get(
+                f"/reports/{self.report.id}/?fields=title,user_can_verify"
+            )
+        self.assertEqual(set(response.data), {"id", "title", "user_can_verify"})
+        self.assertFalse(response.data["user_can_verify"])
+        self.assertNotIn('"description"', queries.captured_queries[1]["sql"])
+
+    def test_my_reports(self):
+        self.get("/my-reports/", 2)
+
+    def test_pending_verifications(self):
+        self.get("/pending-verifications/", 2)
+
+    def test_dashboard_stats(self):
+        response = self.get("/dashboard-stats/", 5)
+        self.assertEqual(response.data["totalReports"], 300)
+
+    def test_scammer_check(self):
+        self.client.credentials()
+        response = self.get(f"/scammer-check/?address={self.report.scammer_address}", 1)
+        self.assertGreater(response.data["reports"], 0)
+
+    def test_create_report(self):
+        with self.assertMaxQueries(3):
+            response = self.client.post(
+                "/reports/",
+                {
+                    "title": "Fake airdrop",
+                    "scammer_address": "0x" + "ab" * 32,
+                    "scam_type": "airdrop",
+                    "description": "Claim page drained the wallet",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def test_verify(self):
+        self.client.credentials(HTTP_X_WALLET_ADDRESS=self.newcomer)
+        url = f"/reports/{self.report.id}/verify/"
+        with self.assertMaxQueries(7):
+            response = self.client.post(
+                url, {"verified": True, "comment": "Same scam hit me"}
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        with self.assertMaxQueries(5):
+            response = self.client.post(
+                url, {"verified": False, "comment": "Changed my mind"}
+            )
+        self.assertEqual(response.status_code, 400, response.content)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """
+    The breaker against a stand-in node that answers every call with a 503.
+    """
+
+    def setUp(self):
+        self.node = StandinNode(error_rate=1.0)
+        self.server = serve(self.node, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        host, port = self.server.server_address
+        self.pool = NetworkPool(
+            "breaker-test",
+            f"http://{host}:{port}/",
+            guard={
+                "failure_threshold": 3,
+                "reset_timeout": 0.2,
+                "rate": 1000,
+                "burst": 1000,
+            },
+        )
+
+    def call(self):
+        return self.pool.call("sui_getTransactionBlock", ["digest"])
+
+    def gauge(self, name):
+        return REGISTRY.get_sample_value(name, {"network": "breaker-test"})
+
+    def test_http_errors_open_the_circuit(self):
+        for _ in range(3):
+            with self.assertRaises(SuiRpcError) as caught:
+                self.call()
+            self.assertNotIsInstance(caught.exception, RpcUnavailable)
+            self.assertIn("HTTP 503", str(caught.exception))
+        self.assertEqual(self.pool.guard.breaker.state, "open")
+        self.assertEqual(self.gauge("scamshield_rpc_circuit_state"), 2)
+        self.assertEqual(self.gauge("scamshield_rpc_circuit_consecutive_failures"), 3)
+
+        # Open: fails fast without reaching the node
+        with mock.patch.object(self.node, "delay") as received:
+            with self.assertRaises(RpcUnavailable):
+                self.call()
+        received.assert_not_called()
+
+    def test_half_open_probe(self):
+        for _ in range(3):
+            with self.assertRaises(SuiRpcError):
+                self.call()
+
+        # A failed probe opens the circuit again
+        time.sleep(0.25)
+        with self.assertRaises(SuiRpcError) as caught:
+            self.call()
+        self.assertNotIsInstance(caught.exception, RpcUnavailable)
+        self.assertEqual(self.pool.guard.breaker.state, "open")
+
+        # A successful one closes it
+        self.node.error_rate = 0.0
+        time.sleep(0.25)
+        self.assertEqual(self.call()["digest"], "digest")
+        self.assertEqual(self.pool.guard.breaker.state, "closed")
+        self.assertEqual(self.gauge("scamshield_rpc_circuit_state"), 0)
+        self.assertEqual(self.gauge("scamshield_rpc_circuit_consecutive_failures"), 0)
+
+
+class HalfOpenProbeTests(SimpleTestCase):
+    """
+    A half-open probe that never gets an answer must not keep the circuit
+    from closing.
+    """
+
+    def setUp(self):
+        self.guard = RpcGuard(failure_threshold=1, reset_timeout=0.05)
+
+        def outage():
+            raise SuiRpcError("down")
+
+        with self.assertRaises(SuiRpcError):
+            self.guard.call(outage)
+        time.sleep(0.06)
+
+    def assertRecovers(self):
+        self.assertEqual(self.guard.breaker.probes_in_flight, 0)
+        self.assertEqual(self.guard.call(lambda: "ok"), "ok")
+        self.assertEqual(self.guard.breaker.state, "closed")
+
+    def test_cancelled_probe(self):
+        async def probe():
+            task = asyncio.ensure_future(self.guard.acall(lambda: asyncio.sleep(10)))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(probe())
+        self.assertEqual(self.guard.breaker.state, "half_open")
+        self.assertRecovers()
+
+    def test_probe_failing_unexpectedly(self):
+        with self.assertRaises(KeyError):
+            self.guard.call(lambda: {}["result"])
+        self.assertRecovers()
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=990-2000", 1000), (990, 999))
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-5000", 1000), (0, 999))
+
+    def test_ignored(self):
+        for header in (None, "", "bytes=-", "items=0-1", "bytes=0-1,5-6"):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 1000))
+
+    def test_unsatisfiable(self):
+        for header in ("bytes=1000-", "bytes=5-4", "bytes=-0"):
+            with self.subTest(header=header):
+                with self.assertRaises(ValueError):
+                    parse_range(header, 1000)
+
+
+class ChooseEncodingTests(SimpleTestCase):
+    def test_choose_encoding(self):
+        cases = {
+            None: None,
+            "identity": None,
+            "gzip": "gzip",
+            "gzip, br": "br",
+            "*": "br",
+            "br;q=0, *": "gzip",
+            "*;q=0, gzip": "gzip",
+            "gzip;q=0, br;q=0, *": None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(choose_encoding(header), expected)
+
+
+class EvidenceFileTests(TemporaryMediaMixin, TestCase):
+    content = bytes(range(256)) * 4
+
+    def setUp(self):
+        super().setUp()
+        wallet_users.clear()
+        report = make_report()
+        User.objects.create(wallet_address=report.reporter_address)
+        self.evidence = Evidence(report=report, type="document", hash="c0ffee")
+        self.evidence.file.save("proof.bin", ContentFile(self.content))
+        self.url = f"/evidence/{self.evidence.id}/file/"
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_WALLET_ADDRESS=report.reporter_address)
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_full(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="image/*")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+        self.assertEqual(response["ETag"], '"c0ffee"')
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_range(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 10-19/1024")
+        self.assertEqual(self.body(response), self.content[10:20])
+
+    def test_suffix_range(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-24")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 1000-1023/1024")
+        self.assertEqual(self.body(response), self.content[-24:])
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2000-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */1024")
+
+    def test_if_range_mismatch_sends_everything(self):
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=10-19", HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+
+    def test_not_modified(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"c0ffee"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"c0ffee"')
+
+
+class ChunkedUploadTests(TemporaryMediaMixin, TestCase):
+    content = b"0123456789"
+
+    def setUp(self):
+        super().setUp()
+        wallet_users.clear()
+        self.report = make_report()
+        User.objects.create(wallet_address=self.report.reporter_address)
+        self.client = APIClient()
+        self.client.credentials(HTTP_X_WALLET_ADDRESS=self.report.reporter_address)
+        response = self.client.post(
+            f"/reports/{self.report.id}/uploads/",
+            {"filename": "proof.txt", "size": len(self.content), "type": "document"},
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.url = f"/evidence-uploads/{response.data['id']}/"
+
+    def put(self, start, end, body=None, total=None):
+        body = self.content[start : end + 1] if body is None else body
+        total = len(self.content) if total is None else total
+        return self.client.put(
+            self.url,
+            body,
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{end}/{total}",
+        )
+
+    def test_resume_and_complete(self):
+        self.assertEqual(self.put(0, 3).data["received"], 4)
+
+        # Out of order: told where to resume from
+        response = self.put(8, 9)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["received"], 4)
+        self.assertEqual(self.client.get(self.url).data["received"], 4)
+
+        response = self.client.post(self.url + "complete/")
+        self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.put(4, 9).data["received"], 10)
+        response = self.client.post(self.url + "complete/")
+        self.assertEqual(response.status_code, 201, response.content)
+        evidence = Evidence.objects.get()
+        self.assertEqual(evidence.hash, hashlib.sha256(self.content).hexdigest())
+        with evidence.file.open("rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+        response = self.client.post(self.url + "complete/")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.put(0, 3).status_code, 409)
+
+    def test_content_range_mismatch(self):
+        # End does not match the body length
+        self.assertEqual(self.put(0, 5, body=b"0123").status_code, 400)
+        # Total is not the declared size
+        self.assertEqual(self.put(0, 3, total=20).status_code, 400)
+        self.assertEqual(self.client.get(self.url).data["received"], 0)
+
+    def test_concurrent_same_offset(self):
+        upload = EvidenceUpload.objects.get()
+        ours, theirs = b"AAAAAAAAAA", b"BBBBBBBBBB"
+        rivals = []
+
+        class SlowBody(io.BytesIO):
+            # A second request for the same offset arrives mid-write
+            def read(self, size=-1):
+                if not rivals:
+                    rival = EvidenceUpload.objects.get()
+                    try:
+                        append_chunk(rival, 0, io.BytesIO(theirs), len(theirs))
+                    except UploadOffsetMismatch as e:
+                        rivals.append(e)
+                    else:
+                        rivals.append(None)
+                return super().read(size)
+
+        append_chunk(upload, 0, SlowBody(ours), len(ours))
+        self.assertIsInstance(rivals[0], UploadOffsetMismatch)
+
+        # A late retry with other bytes is turned away without writing
+        late = EvidenceUpload.objects.get()
+        late.received = 0
+        with self.assertRaises(UploadOffsetMismatch):
+            append_chunk(late, 0, io.BytesIO(theirs), len(theirs))
+
+        self.assertEqual(partial_path(upload).read_bytes(), ours)
+        evidence = complete_upload(upload)
+        self.assertEqual(evidence.hash, hashlib.sha256(ours).hexdigest())
+
+    def test_concurrent_completion(self):
+        self.put(0, 9)
+        upload = EvidenceUpload.objects.get()
+        # Both requests passed the view's check before either finished
+        first, second = upload, EvidenceUpload.objects.get()
+        complete_upload(first)
+        partial_path(second).write_bytes(self.content)
+        with self.assertRaises(UploadAlreadyCompleted):
+            complete_upload(second)
+        self.assertEqual(Evidence.objects.count(), 1)
+
+
+class EvidenceBlobTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.report = make_report()
+
+    def add(self, content=b"same screenshot"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_evidence(
+                self.report, ContentFile(content, name="shot.png"), type="screenshot"
+            )
+
+    def delete(self, evidence):
+        with self.captureOnCommitCallbacks(execute=True):
+            evidence.delete()
+
+    def test_same_content_shares_a_blob(self):
+        first, second = self.add(), self.add()
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertEqual(first.file.name, second.file.name)
+        blob = EvidenceBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(
+            default_storage.listdir(f"evidence/sha256/{blob.hash[:2]}")[1],
+            [f"{blob.hash}.png"],
+        )
+
+        self.add(b"other screenshot")
+        self.assertEqual(EvidenceBlob.objects.count(), 2)
+
+    def test_deleting_evidence_releases_the_blob(self):
+        first, second = self.add(), self.add()
+        name = first.file.name
+
+        self.delete(first)
+        self.assertEqual(EvidenceBlob.objects.get().ref_count, 1)
+        self.assertTrue(default_storage.exists(name))
+
+        # The last reference takes the blob and its file with it
+        self.delete(second)
+        self.assertFalse(EvidenceBlob.objects.exists())
+        self.assertFalse(default_storage.exists(name))
+
+
+class AsyncMiddlewareTests(TestCase):
+    """
+    The middleware stack under ASGI, where it runs without sync adapters.
+    """
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=1.0)
+    async def test_profiled_request(self):
+        labels = {"view": "scammer-check", "method": "GET", "status": "200"}
+        before = REGISTRY.get_sample_value("scamshield_view_responses_total", labels)
+        response = await self.async_client.get(
+            "/scammer-check/", {"address": "0x" + "ef" * 32}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        # Queries on the sync thread are counted too
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+        after = REGISTRY.get_sample_value("scamshield_view_responses_total", labels)
+        self.assertEqual(after, (before or 0) + 1)
+
+
+class BackfillTests(TestCase):
+    def test_fetch_range(self):
+        events = synthetic_events(60, days=3)
+        # Events of other packages share the time range
+        for index, event in enumerate(events[::3]):
+            events.append(
+                {
+                    **event,
+                    "id": {"txDigest": f"other{index}", "eventSeq": "0"},
+                    "type": "0x2::coin::CoinEvent",
+                }
+            )
+        node = StandinNode({**load_fixtures([]), "sui_getEvents": events})
+        module_events = events[:60]
+        start_ms = int(module_events[40]["timestampMs"])
+        end_ms = int(module_events[50]["timestampMs"])
+
+        pages = []
+
+        def request(method, params):
+            page = node.sui_getEvents(*params)
+            pages.append(page["data"])
+            return page
+
+        with mock.patch.object(
+            backfill_events, "_rpc_slots", threading.BoundedSemaphore(1)
+        ), mock.patch.object(SuiClient, "_make_request", side_effect=request):
+            fetched = backfill_events.fetch_range("testnet", start_ms, end_ms, 5)
+
+        self.assertEqual(fetched, module_events[40:50])
+        # A later range never fetches pages of the ranges before it
+        for page in pages:
+            for event in page:
+                self.assertGreaterEqual(int(event["timestampMs"]), start_ms)
+                self.assertLess(int(event["timestampMs"]), end_ms)
+
+    def plan(self, since_ms, until_ms, step_ms):
+        ranges = backfill_events.plan_ranges("job", since_ms, until_ms, step_ms)
+        return [(r.start_ms, r.end_ms) for r in ranges]
+
+    def test_plan_ranges(self):
+        self.assertEqual(self.plan(0, 250, 100), [(0, 100), (100, 200), (200, 250)])
+        BackfillRange.objects.filter(start_ms=0).update(completed=True)
+
+        # Resuming with a different width replaces the unfinished ranges
+        self.assertEqual(
+            self.plan(0, 250, 40), [(100, 140), (140, 180), (180, 220), (220, 250)]
+        )
+        BackfillRange.objects.filter(start_ms__in=[100, 180]).update(completed=True)
+
+        # Extending the end fills the gaps around what is done
+        self.assertEqual(self.plan(0, 300, 100), [(140, 180), (220, 300)])
+        self.assertEqual(BackfillRange.objects.filter(job="job").count(), 5)
+
+
+class MerchantThrottleTests(TestCase):
+    @override_settings(
+        MERCHANT_RATE_LIMITS={"pending-verifications": {"rate": 0.01, "burst": 2}}
+    )
+    def test_pending_verifications_has_its_own_limit(self):
+        merchant_keys.clear()
+        user = User.objects.create(wallet_address="0x" + "12" * 20)
+        Merchant.objects.create(user=user, api_key="throttled-key")
+        client = APIClient()
+        client.credentials(HTTP_X_API_KEY="throttled-key")
+
+        statuses = [client.get("/pending-verifications/").status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+        # Other scopes are unaffected
+        self.assertEqual(client.get("/reports/").status_code, 200)
+
+
+class EvidenceDerivativeTests(TemporaryMediaMixin, TransactionTestCase):
+    """
+    Uploads leave blobs pending; build_evidence_derivatives builds them.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.report = make_report()
+
+    def add(self, content, name):
+        evidence = create_evidence(self.report, ContentFile(content, name=name))
+        return evidence.blob
+
+    def png(self, color):
+        output = io.BytesIO()
+        Image.new("RGB", (640, 480), color).save(output, "PNG")
+        return output.getvalue()
+
+    def build(self, *args):
+        output = StringIO()
+        call_command("build_evidence_derivatives", *args, workers=1, stdout=output)
+        return output.getvalue()
+
+    def test_pending_until_built(self):
+        image = self.add(self.png("red"), "shot.png")
+        text = self.add(b"not an image", "notes.txt")
+        self.assertEqual(image.derivatives_status, "pending")
+
+        self.build()
+        image.refresh_from_db()
+        text.refresh_from_db()
+        self.assertEqual(image.derivatives_status, "ready")
+        self.assertTrue(default_storage.exists(image.thumbnail.name))
+        with Image.open(image.preview) as preview:
+            self.assertEqual(preview.size, (640, 480))
+        self.assertEqual(text.derivatives_status, "unsupported")
+
+    def test_failed_builds_are_retried_on_request(self):
+        blob = self.add(self.png("blue"), "shot.png")
+        with mock.patch("core.derivatives._build_image", side_effect=OSError):
+            self.build()
+        blob.refresh_from_db()
+        self.assertEqual(blob.derivatives_status, "failed")
+
+        self.assertIn("Nothing to do", self.build())
+        self.build("--retry-failed")
+        blob.refresh_from_db()
+        self.assertEqual(blob.derivatives_status, "ready")
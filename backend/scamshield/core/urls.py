@@ -1,16 +1,23 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from core.media import EvidenceFileView
 from core.views import (
     ScamReportViewSet,
+    EvidenceUploadViewSet,
     MyReportsView,
     PendingVerificationsView,
     DashboardStatsView,
     VerifyTransactionView,
     ScamWalletLookupView,
+    RpcStatusView,
+    AsyncVerifyTransactionView,
+    AsyncScamWalletLookupView,
 )
 
 router = DefaultRouter()
 router.register(r"reports", ScamReportViewSet)
+router.register(r"evidence-uploads", EvidenceUploadViewSet)
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -23,8 +30,22 @@ urlpatterns = [
     path("dashboard-stats/", DashboardStatsView.as_view(), name="dashboard-stats"),
     path(
         "api/verify-sui-transaction/",
-        VerifyTransactionView.as_view(),
+        (
+            AsyncVerifyTransactionView
+            if settings.ASYNC_VIEWS
+            else VerifyTransactionView
+        ).as_view(),
         name="verify_transaction",
     ),
-    path("scammer-check/", ScamWalletLookupView.as_view(), name="scammer-check"),
+    path(
+        "scammer-check/",
+        (
+            AsyncScamWalletLookupView if settings.ASYNC_VIEWS else ScamWalletLookupView
+        ).as_view(),
+        name="scammer-check",
+    ),
+    path("rpc-status/", RpcStatusView.as_view(), name="rpc-status"),
+    path(
+        "evidence/<uuid:pk>/file/", EvidenceFileView.as_view(), name="evidence-file"
+    ),
 ]
@@ -1,18 +1,58 @@
-import requests
 import math
 from django.utils import timezone
 from core.models import ScamReport
+from core.sui_service import SuiClient
 
-SUI_RPC_URL = "https://fullnode.testnet.sui.io:443"
 
+def summarize_transaction(tx_result: dict) -> dict:
+    """
+    Extracts the execution status, sender, reference_id and created object_id
+    from a ``sui_getTransactionBlock`` result.
+    """
+    status_text = tx_result.get("effects", {}).get("status", {}).get("status")
+    sender = tx_result.get("transaction", {}).get("data", {}).get("sender")
+    transaction_inputs = (
+        tx_result.get("transaction", {})
+        .get("data", {})
+        .get("transaction", {})
+        .get("inputs", [])
+    )
+
+    # Optional reference_id logic (from string-type inputs)
+    reference_id = None
+    for txn_input in transaction_inputs:
+        if txn_input.get("type") == "pure" and txn_input.get(
+            "valueType", ""
+        ).endswith("String"):
+            value = txn_input.get("value", "")
+            if value.startswith("cs_") or value.startswith("ref_"):
+                reference_id = value
+                break
+
+    # Extract created object ID
+    created_object_id = None
+    object_changes = tx_result.get("objectChanges", [])
+    for change in object_changes:
+        if change.get("type") == "created":
+            created_object_id = change.get("objectId")
+            break
+
+    return {
+        "success": status_text == "success",
+        "sender": sender,
+        "reference_id": reference_id,
+        "object_id": created_object_id,
+    }
 
-def verify_sui_transaction(tx_digest: str, report_id: str) -> dict:
+
+def verify_sui_transaction(tx_digest: str, report_id: str, network: str = None) -> dict:
     """
     Verifies a Sui transaction and extracts sender, reference_id, and created object_id.
 
     Args:
         tx_digest (str): The transaction digest hash.
         report_id (str): The UID id of the report.
+        network (str): The Sui network the transaction was sent to.
 
     Returns:
         dict: {
@@ -27,44 +67,14 @@ def verify_sui_transaction(tx_digest: str, report_id: str) -> dict:
     if not tx_digest:
         return {"verified": False, "message": "Missing transaction digest"}
 
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "sui_getTransactionBlock",
-        "params": [
-            tx_digest,
-            {
-                "showInput": True,
-                "showEffects": True,
-                "showEvents": True,
-                "showObjectChanges": True,
-                "showBalanceChanges": True,
-            },
-        ],
-    }
-
     try:
-        res = requests.post(SUI_RPC_URL, json=payload)
-        result = res.json()
-
-        if "error" in result:
-            return {"verified": False, "message": result["error"].get("message")}
-
-        tx_result = result.get("result", {})
-        status_text = tx_result.get("effects", {}).get("status", {}).get("status")
+        tx_result = SuiClient(network).get_transaction_block(tx_digest)
+        summary = summarize_transaction(tx_result)
 
-        if status_text != "success":
+        if not summary["success"]:
             return {"verified": False, "message": "Transaction failed or not found"}
 
-        sender = tx_result.get("transaction", {}).get("data", {}).get("sender")
-
-        # Extract created object ID
-        created_object_id = None
-        object_changes = tx_result.get("objectChanges", [])
-        for change in object_changes:
-            if change.get("type") == "created":
-                created_object_id = change.get("objectId")
-                break
+        created_object_id = summary["object_id"]
         try:
             print(f"Gettting report with id: {report_id}")
             report = ScamReport.objects.get(id=report_id)
@@ -74,10 +84,10 @@ def verify_sui_transaction(tx_digest: str, report_id: str) -> dict:
 
         print(f"sui object id: {created_object_id}: ")
         report.sui_object_id = created_object_id
-        report.save()
+        report.save(update_fields=["sui_object_id"])
         return {
             "verified": True,
-            "sender": sender,
+            "sender": summary["sender"],
             "object_id": created_object_id,
             "message": "Transaction verified successfully",
         }
@@ -104,3 +114,49 @@ def compute_weighted_score(report, is_verified=True):
     verified_multiplier = 1.0 if is_verified else 0.25  # unverified has 25% weight
 
     return time_decay * stake_weight * txn_weight * risk_weight * verified_multiplier
+
+
+# Fields compute_weighted_score and summarize_scam_reports read
+SCAM_SCORE_FIELDS = (
+    "status",
+    "created_at",
+    "stake_amount",
+    "transaction_amount",
+    "risk_level",
+)
+
+
+def summarize_scam_reports(reports):
+    """
+    Risk summary of a wallet from the reports against it, as returned by
+    ``scammer-check/``.
+    """
+    if not reports:
+        return {"isScam": False, "reports": 0}
+
+    score = sum(
+        compute_weighted_score(r, True) for r in reports if r.status == "verified"
+    )
+    # pending + rejected
+    score += sum(
+        compute_weighted_score(r, False) for r in reports if r.status != "verified"
+    )
+
+    # Risk severity thresholds
+    if score > 20:
+        severity = "Critical"
+    elif score > 10:
+        severity = "High"
+    elif score > 5:
+        severity = "Medium"
+    else:
+        severity = "Low"
+
+    last_reported = max(r.created_at for r in reports)
+    return {
+        "isScam": True,
+        "reports": len(reports),
+        "lastReported": last_reported.strftime("%Y-%m-%d %H:%M:%S"),
+        "severity": severity,
+        "score": round(score, 2),
+    }
@@ -1,26 +1,58 @@
-import requests
-from rest_framework import viewsets, permissions, status, generics
+import json
+import math
+import re
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import viewsets, mixins, permissions, status, generics
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
-from django.db.models import Q, Sum, Count
-
-from .models import ScamReport, Evidence, Verification, ScamTactic, TimelineEvent
+from django.db import IntegrityError
+from django.db.models import Prefetch, Q, Sum, Count
+
+from .models import (
+    ScamReport,
+    Evidence,
+    EvidenceUpload,
+    ScamTactic,
+    TimelineEvent,
+)
 from .serializers import (
     ScamReportListSerializer,
     ScamReportDetailSerializer,
     ScamReportCreateSerializer,
     VerificationCreateSerializer,
     EvidenceSerializer,
+    EvidenceUploadSerializer,
     VerifyTransactionSerializer,
 )
+from core.evidence import (
+    IncompleteChunk,
+    UploadAlreadyCompleted,
+    UploadOffsetMismatch,
+    append_chunk,
+    complete_upload,
+)
+from core.fieldsets import only_requested, requested_fields
 from core.filters import ScamReportFilter
 from core.pagination import TenPerPagePagination
-from core.utils import compute_weighted_score
+from core.rpc import RpcUnavailable, SuiNodeError, SuiRpcError, router
+from core.sui_service import AsyncSuiClient, SuiClient
+from core.utils import (
+    SCAM_SCORE_FIELDS,
+    summarize_scam_reports,
+    summarize_transaction,
+)
+from scamshield.authentication import MerchantApiKeyAuthentication
+from scamshield.throttling import MerchantRateThrottle
 
-SUI_RPC_URL = "https://fullnode.testnet.sui.io:443"
+CONTENT_RANGE_RE = re.compile(r"^bytes (?P<start>\d+)-(?P<end>\d+)/(?P<total>\d+|\*)$")
 
 
 class ScamReportViewSet(viewsets.ModelViewSet):
@@ -30,6 +62,7 @@ class ScamReportViewSet(viewsets.ModelViewSet):
 
     queryset = ScamReport.objects.all().order_by("-created_at")
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "reports"
     filter_backends = [DjangoFilterBackend]
     filterset_class = ScamReportFilter
     pagination_class = TenPerPagePagination
@@ -43,6 +76,33 @@ class ScamReportViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         queryset = ScamReport.objects.all().order_by("-created_at")
+        if self.action == "list":
+            queryset = only_requested(queryset, self.request, ScamReportListSerializer)
+        elif self.action == "retrieve":
+            queryset = only_requested(
+                queryset,
+                self.request,
+                ScamReportDetailSerializer,
+                depends_on={"user_can_verify": ["reporter_address"]},
+            )
+            relations = {
+                "evidence": Prefetch(
+                    "evidence", queryset=Evidence.objects.select_related("blob")
+                ),
+                "verifications": "verifications",
+                "scam_tactics": "scam_tactics",
+                "timeline": "timeline",
+            }
+            requested = requested_fields(self.request)
+            if requested is not None:
+                if "user_can_verify" in requested:
+                    requested.add("verifications")
+                relations = {
+                    name: lookup
+                    for name, lookup in relations.items()
+                    if name in requested
+                }
+            queryset = queryset.prefetch_related(*relations.values())
 
         # Filter by status if provided
         status = self.request.query_params.get("status", None)
@@ -94,21 +154,19 @@ class ScamReportViewSet(viewsets.ModelViewSet):
         """
         report = self.get_object()
 
-        # Check if user already verified this report
-        if Verification.objects.filter(
-            report=report, verifier=request.user.wallet_address
-        ).exists():
-            return Response(
-                {"detail": "You have already verified this report"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
         serializer = VerificationCreateSerializer(
             data=request.data, context={"request": request, "report": report}
         )
 
         if serializer.is_valid():
-            serializer.save()
+            try:
+                serializer.save()
+            except IntegrityError:
+                # A second verification by the same user hits the unique constraint
+                return Response(
+                    {"detail": "You have already verified this report"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -134,6 +192,31 @@ class ScamReportViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated],
+        url_path="uploads",
+    )
+    def start_upload(self, request, pk=None):
+        """
+        Start a chunked, resumable evidence upload for an existing report.
+        """
+        report = self.get_object()
+
+        # Only allow the reporter to add evidence
+        if report.reporter_address != request.user.wallet_address:
+            return Response(
+                {"detail": "Only the reporter can add evidence"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = EvidenceUploadSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save(report=report)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
     @action(
         detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated]
     )
@@ -164,6 +247,119 @@ class ScamReportViewSet(viewsets.ModelViewSet):
         )
 
 
+class EvidenceUploadViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Chunked evidence uploads.
+
+    Send each chunk as the raw body of a PUT with a ``Content-Range: bytes
+    start-end/total`` header. After an interruption, GET the upload and
+    resume from ``received``. POST to ``complete/`` once every byte is sent.
+    """
+
+    queryset = EvidenceUpload.objects.all()
+    serializer_class = EvidenceUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return EvidenceUpload.objects.filter(
+            report__reporter_address=self.request.user.wallet_address
+        )
+
+    def update(self, request, pk=None):
+        upload = self.get_object()
+        if upload.evidence_id:
+            return Response(
+                {"detail": "Upload already completed"}, status=status.HTTP_409_CONFLICT
+            )
+
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+        if length <= 0:
+            return Response(
+                {"detail": "Empty chunk"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if length > settings.EVIDENCE_UPLOAD_MAX_CHUNK:
+            return Response(
+                {"detail": f"Chunks are limited to {settings.EVIDENCE_UPLOAD_MAX_CHUNK} bytes"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        offset = upload.received
+        content_range = request.headers.get("Content-Range")
+        if content_range:
+            match = CONTENT_RANGE_RE.match(content_range)
+            if not match:
+                return Response(
+                    {"detail": "Invalid Content-Range header"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            offset, end = int(match.group("start")), int(match.group("end"))
+            total = match.group("total")
+            if end - offset + 1 != length:
+                return Response(
+                    {"detail": "Content-Range does not match the chunk length"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if total != "*" and (
+                int(total) <= end or (upload.size and int(total) != upload.size)
+            ):
+                return Response(
+                    {"detail": "Content-Range total does not match the upload size"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        limit = upload.size or settings.EVIDENCE_UPLOAD_MAX_SIZE
+        if offset + length > limit:
+            return Response(
+                {"detail": "Chunk goes past the end of the upload"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            # Read the body straight from the request stream, block by block
+            append_chunk(upload, offset, request.stream, length)
+        except UploadAlreadyCompleted:
+            return Response(
+                {"detail": "Upload already completed"}, status=status.HTTP_409_CONFLICT
+            )
+        except UploadOffsetMismatch as e:
+            return Response(
+                {"detail": str(e), "received": e.expected},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except IncompleteChunk as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(self.get_serializer(upload).data)
+
+    @action(detail=True, methods=["post"])
+    def complete(self, request, pk=None):
+        """
+        Store a fully received upload as evidence on its report.
+        """
+        upload = self.get_object()
+        if upload.evidence_id:
+            return Response(
+                {"detail": "Upload already completed"}, status=status.HTTP_409_CONFLICT
+            )
+        if not upload.received or (upload.size and upload.received != upload.size):
+            return Response(
+                {"detail": "Upload is incomplete", "received": upload.received},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            evidence = complete_upload(upload)
+        except UploadAlreadyCompleted:
+            return Response(
+                {"detail": "Upload already completed"}, status=status.HTTP_409_CONFLICT
+            )
+        except UploadOffsetMismatch as e:
+            return Response(
+                {"detail": str(e), "received": e.expected},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(EvidenceSerializer(evidence).data, status=status.HTTP_201_CREATED)
+
+
 class MyReportsView(generics.ListAPIView):
     """
     API endpoint to list reports submitted by the authenticated user.
@@ -171,11 +367,13 @@ class MyReportsView(generics.ListAPIView):
 
     serializer_class = ScamReportListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "reports"
 
     def get_queryset(self):
-        return ScamReport.objects.filter(
+        queryset = ScamReport.objects.filter(
             reporter_address=self.request.user.wallet_address
         ).order_by("-created_at")
+        return only_requested(queryset, self.request, self.serializer_class)
 
 
 class PendingVerificationsView(generics.ListAPIView):
@@ -185,10 +383,11 @@ class PendingVerificationsView(generics.ListAPIView):
 
     serializer_class = ScamReportListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "pending-verifications"
 
     def get_queryset(self):
         # Get reports that are pending and within verification period
-        return (
+        queryset = (
             ScamReport.objects.filter(
                 status="pending", verification_deadline__gt=timezone.now()
             )
@@ -198,6 +397,7 @@ class PendingVerificationsView(generics.ListAPIView):
             )
             .order_by("-created_at")
         )
+        return only_requested(queryset, self.request, self.serializer_class)
 
 
 class DashboardStatsView(APIView):
@@ -208,18 +408,21 @@ class DashboardStatsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        # Total reports
-        total_reports = ScamReport.objects.count()
+        # Totals in a single pass over the table
+        totals = ScamReport.objects.aggregate(
+            reports=Count("id"),
+            verified=Count("id", filter=Q(status="verified")),
+            pending=Count("id", filter=Q(status="pending")),
+            prevented_value=Sum("transaction_amount"),
+        )
+        total_reports = totals["reports"]
         most_recent_reports = ScamReport.objects.all().order_by("-created_at")
         four_most_recent_reports = most_recent_reports[:4]
         my_most_recent_reports = ScamReport.objects.filter(
             reporter_address=request.user.wallet_address
         ).order_by("-created_at")[:4]
 
-        verified_scams = ScamReport.objects.filter(status="verified")
-        prevented_value_sui = (
-            ScamReport.objects.aggregate(total=Sum("transaction_amount"))["total"] or 0
-        )
+        prevented_value_sui = totals["prevented_value"] or 0
         prevented_value_usd = prevented_value_sui
         scam_type_counts = (
             ScamReport.objects.values("scam_type")
@@ -235,8 +438,8 @@ class DashboardStatsView(APIView):
         ]
         stats = {
             "totalReports": total_reports,
-            "totalVerified": verified_scams.count(),
-            "totalPending": ScamReport.objects.filter(status="pending").count(),
+            "totalVerified": totals["verified"],
+            "totalPending": totals["pending"],
             "preventedValue": (
                 f"${prevented_value_usd/1000000:.1f}M"
                 if prevented_value_usd >= 1000000
@@ -254,6 +457,34 @@ class DashboardStatsView(APIView):
         return Response(stats)
 
 
+def verification_result(summary):
+    if not summary["success"]:
+        return {"verified": False, "message": "Transaction failed or not found"}
+    return {
+        "verified": True,
+        "message": "Transaction verified successfully",
+        "sender": summary["sender"],
+        "reference_id": summary["reference_id"],
+        "object_id": summary["object_id"],
+    }
+
+
+def rpc_error_response(e):
+    """
+    Body, status code and headers of the response to a failed Sui RPC call.
+    """
+    if isinstance(e, RpcUnavailable):
+        # Fail fast while the node is unhealthy instead of holding a worker
+        return (
+            {"verified": False, "error": str(e)},
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            {"Retry-After": str(math.ceil(e.retry_after or 1))},
+        )
+    if isinstance(e, SuiNodeError):
+        return {"verified": False, "error": str(e)}, status.HTTP_400_BAD_REQUEST, {}
+    return {"verified": False, "error": str(e)}, status.HTTP_502_BAD_GATEWAY, {}
+
+
 class VerifyTransactionView(APIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = VerifyTransactionSerializer
@@ -263,120 +494,114 @@ class VerifyTransactionView(APIView):
         if not tx_digest:
             return Response({"error": "Missing transaction digest"}, status=400)
 
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "sui_getTransactionBlock",
-            "params": [
-                tx_digest,
-                {
-                    "showInput": True,
-                    "showEffects": True,
-                    "showEvents": True,
-                    "showObjectChanges": True,
-                    "showBalanceChanges": True,
-                },
-            ],
-        }
+        network = request.data.get("network") or settings.SUI_DEFAULT_NETWORK
+        if network not in settings.SUI_NETWORKS:
+            return Response({"error": f"Unknown network: {network}"}, status=400)
 
         try:
-            res = requests.post(SUI_RPC_URL, json=payload)
-            result = res.json()
-
-            if "error" in result:
-                return Response(
-                    {"verified": False, "error": result["error"]}, status=400
-                )
-
-            tx_result = result.get("result", {})
-            status_text = tx_result.get("effects", {}).get("status", {}).get("status")
-
-            if status_text != "success":
-                return Response(
-                    {"verified": False, "message": "Transaction failed or not found"}
-                )
-
-            sender = tx_result.get("transaction", {}).get("data", {}).get("sender")
-            transaction_inputs = (
-                tx_result.get("transaction", {})
-                .get("data", {})
-                .get("transaction", {})
-                .get("inputs", [])
-            )
-
-            # Optional reference_id logic (from string-type inputs)
-            reference_id = None
-            for txn_input in transaction_inputs:
-                if txn_input.get("type") == "pure" and txn_input.get(
-                    "valueType", ""
-                ).endswith("String"):
-                    value = txn_input.get("value", "")
-                    if value.startswith("cs_") or value.startswith("ref_"):
-                        reference_id = value
-                        break
-
-            # ✅ Extract created object ID from objectChanges
-            object_changes = tx_result.get("objectChanges", [])
-            created_object_id = None
-            for change in object_changes:
-                if change.get("type") == "created":
-                    created_object_id = change.get("objectId")
-                    break
-
-            return Response(
-                {
-                    "verified": True,
-                    "message": "Transaction verified successfully",
-                    "sender": sender,
-                    "reference_id": reference_id,
-                    "object_id": created_object_id,
-                }
-            )
-
+            tx_result = SuiClient(network).get_transaction_block(tx_digest)
+            return Response(verification_result(summarize_transaction(tx_result)))
+        except SuiRpcError as e:
+            body, code, headers = rpc_error_response(e)
+            return Response(body, status=code, headers=headers)
         except Exception as e:
             return Response({"error": str(e)}, status=500)
 
 
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from django.utils import timezone
-import math
-from .models import ScamReport
+class RpcStatusView(APIView):
+    """
+    Circuit breaker and rate limit state of the Sui RPC guard, per network.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(router.snapshot())
 
 
 class ScamWalletLookupView(APIView):
     permission_classes = []  # Public endpoint
+    throttle_scope = "scammer-check"
 
     def get(self, request):
         address = request.query_params.get("address")
         if not address:
             return Response({"error": "Wallet address is required."}, status=400)
 
-        all_reports = ScamReport.objects.filter(scammer_address__iexact=address)
-        if not all_reports.exists():
-            return Response({"isScam": False, "reports": 0})
-
-        verified_reports = all_reports.filter(status="verified")
-        non_verified_reports = all_reports.exclude(status="verified")  # pending + rejected
+        reports = list(
+            ScamReport.objects.filter(scammer_address__iexact=address).only(
+                *SCAM_SCORE_FIELDS
+            )
+        )
+        return Response(summarize_scam_reports(reports))
 
 
-        score = sum(compute_weighted_score(r, True) for r in verified_reports)
-        score += sum(compute_weighted_score(r, False) for r in non_verified_reports)
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncVerifyTransactionView(View):
+    """
+    ``VerifyTransactionView`` for ASGI deployments: waiting on the Sui node
+    suspends the request instead of holding a worker.
+    """
 
-        # Risk severity thresholds
-        if score > 20:
-            severity = "Critical"
-        elif score > 10:
-            severity = "High"
-        elif score > 5:
-            severity = "Medium"
+    async def post(self, request):
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body or b"{}")
+            except ValueError:
+                return JsonResponse({"error": "Invalid JSON"}, status=400)
         else:
-            severity = "Low"
-
-        return Response({
-            "isScam": True,
-            "reports": all_reports.count(),
-            "lastReported": all_reports.order_by("-created_at").first().created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "severity": severity,
-            "score": round(score, 2),
-        })
+            data = request.POST
+
+        tx_digest = data.get("transaction_hash")
+        if not tx_digest:
+            return JsonResponse({"error": "Missing transaction digest"}, status=400)
+
+        network = data.get("network") or settings.SUI_DEFAULT_NETWORK
+        if network not in settings.SUI_NETWORKS:
+            return JsonResponse({"error": f"Unknown network: {network}"}, status=400)
+
+        try:
+            tx_result = await AsyncSuiClient(network).get_transaction_block(tx_digest)
+            return JsonResponse(verification_result(summarize_transaction(tx_result)))
+        except SuiRpcError as e:
+            body, code, headers = rpc_error_response(e)
+            return JsonResponse(body, status=code, headers=headers)
+        except Exception as e:
+            return JsonResponse({"error": str(e)}, status=500)
+
+
+class AsyncScamWalletLookupView(View):
+    """
+    ``ScamWalletLookupView`` for ASGI deployments, using the async ORM.
+    """
+
+    async def get(self, request):
+        try:
+            auth = await MerchantApiKeyAuthentication().aauthenticate(request)
+        except AuthenticationFailed as e:
+            return JsonResponse({"detail": str(e.detail)}, status=401)
+        if auth is not None:
+            # In-memory token bucket and usage counter; the usage meter's
+            # own thread writes to the database
+            wait = MerchantRateThrottle().check(auth[1], "scammer-check")
+            if wait:
+                return JsonResponse(
+                    {
+                        "detail": "Request was throttled. Expected available in "
+                        f"{math.ceil(wait)} seconds."
+                    },
+                    status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+
+        address = request.GET.get("address")
+        if not address:
+            return JsonResponse({"error": "Wallet address is required."}, status=400)
+
+        reports = [
+            report
+            async for report in ScamReport.objects.filter(
+                scammer_address__iexact=address
+            ).only(*SCAM_SCORE_FIELDS)
+        ]
+        return JsonResponse(summarize_scam_reports(reports))
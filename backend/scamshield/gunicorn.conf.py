@@ -0,0 +1,27 @@
+# gunicorn -c gunicorn.conf.py scamshield.wsgi
+#
+# Metrics are collected across workers in PROMETHEUS_MULTIPROC_DIR, which is
+# emptied when gunicorn starts. Run management commands with the same value
+# to include their job metrics.
+import os
+import shutil
+
+# Must be set before prometheus_client is imported anywhere: it picks
+# in-process or multiprocess values at import time
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/scamshield-metrics")
+
+from prometheus_client import multiprocess  # noqa: E402
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "4"))
+
+
+def on_starting(server):
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    # Samples left by a previous run would be added to this one's
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,20 +1,196 @@
 # middleware/wallet_auth.py
 
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router
+
+from authy.models import Merchant
 
 User = get_user_model()
 
 
+class LookupCache:
+    """
+    Bounded LRU with a TTL, in front of an optional shared Django cache, for
+    lookups authentication would otherwise hit the database for.
+    """
+
+    def __init__(self, prefix, size=10000, ttl=300, shared_cache=None):
+        self.prefix = prefix
+        self.size = size
+        self.ttl = ttl
+        self.shared_cache = shared_cache
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _shared(self):
+        return caches[self.shared_cache] if self.shared_cache else None
+
+    def _key(self, key):
+        return f"{self.prefix}:{key}"
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        shared = self._shared()
+        if shared is not None:
+            user = shared.get(self._key(key))
+            if user is not None:
+                self._remember(key, user)
+                return user
+        return None
+
+    def _remember(self, key, user):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def set(self, key, user):
+        self._remember(key, user)
+        shared = self._shared()
+        if shared is not None:
+            shared.set(self._key(key), user, self.ttl)
+
+    def forget(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        shared = self._shared()
+        if shared is not None:
+            shared.delete(self._key(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Wallet address -> User
+wallet_users = LookupCache("wallet-user", **settings.WALLET_AUTH_CACHE)
+# SHA-256 of an API key -> Merchant (with its user, without the encrypted key)
+merchant_keys = LookupCache("merchant-key", **settings.MERCHANT_KEY_CACHE)
+
+
+def get_or_create_wallet_user(wallet_address):
+    """
+    The user of a wallet, created on first sight.
+
+    The common case is a single SELECT. A new wallet costs an INSERT that
+    ignores conflicts plus a SELECT, so concurrent first requests for the
+    same wallet neither fail nor need a savepoint.
+    """
+    user = User.objects.filter(wallet_address=wallet_address).first()
+    if user is None:
+        User.objects.bulk_create(
+            [User(wallet_address=wallet_address)], ignore_conflicts=True
+        )
+        # Read back from where it was written, not from a lagging replica
+        user = User.objects.using(router.db_for_write(User)).get(
+            wallet_address=wallet_address
+        )
+    return user
+
+
 class WalletAddressAuthentication(BaseAuthentication):
     def authenticate(self, request):
         wallet_address = request.headers.get("X-Wallet-Address")
         if not wallet_address:
             return None  # Let other authenticators handle
 
-        try:
-            user, _ = User.objects.get_or_create(wallet_address=wallet_address)
-            return (user, None)
-        except Exception:
-            raise AuthenticationFailed("Invalid wallet address")
+        user = wallet_users.get(wallet_address)
+        if user is None:
+            try:
+                user = get_or_create_wallet_user(wallet_address)
+            except Exception:
+                raise AuthenticationFailed("Invalid wallet address")
+            wallet_users.set(wallet_address, user)
+        # Each request gets its own instance; the cached one is shared
+        return (copy.copy(user), None)
+
+
+def hash_api_key(api_key):
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class MerchantApiKeyAuthentication(BaseAuthentication):
+    """
+    Authenticates merchants by the API key in ``X-Api-Key`` (or
+    ``Authorization: Api-Key <key>``). The key is matched on its indexed
+    SHA-256 and is never decrypted; ``request.auth`` is the merchant.
+    """
+
+    keyword = "Api-Key"
+
+    def get_api_key(self, request):
+        api_key = request.headers.get("X-Api-Key")
+        if api_key:
+            return api_key
+        parts = request.headers.get("Authorization", "").split()
+        if len(parts) == 2 and parts[0] == self.keyword:
+            return parts[1]
+        return None
+
+    def _merchants(self, digest):
+        return (
+            Merchant.objects.select_related("user")
+            .defer("api_key")
+            .filter(api_key_hash=digest)
+        )
+
+    def _found(self, digest, merchant):
+        if merchant is None or merchant.user is None:
+            raise AuthenticationFailed("Invalid API key")
+        merchant_keys.set(digest, merchant)
+        return merchant
+
+    def authenticate(self, request):
+        api_key = self.get_api_key(request)
+        if not api_key:
+            return None  # Let other authenticators handle
+
+        digest = hash_api_key(api_key)
+        merchant = merchant_keys.get(digest)
+        if merchant is None:
+            merchant = self._found(digest, self._merchants(digest).first())
+        # Each request gets its own instances; the cached ones are shared
+        merchant = copy.copy(merchant)
+        merchant.user = copy.copy(merchant.user)
+        return (merchant.user, merchant)
+
+    async def aauthenticate(self, request):
+        """
+        ``authenticate`` for async views, which get a plain ``HttpRequest``.
+        """
+        api_key = self.get_api_key(request)
+        if not api_key:
+            return None
+
+        digest = hash_api_key(api_key)
+        # The lookup cache may be a network cache; keep it off the event loop
+        merchant = await sync_to_async(merchant_keys.get)(digest)
+        if merchant is None:
+            found = await self._merchants(digest).afirst()
+            merchant = await sync_to_async(self._found)(digest, found)
+        # Each request gets its own instances; the cached ones are shared
+        merchant = copy.copy(merchant)
+        merchant.user = copy.copy(merchant.user)
+        return (merchant.user, merchant)
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,109 @@
+import gzip
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(
+    r"^(text/|application/(json|javascript|xml|yaml|vnd\.oai\.openapi)|[^;]*\+json)"
+)
+ENCODING_RE = re.compile(r"^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$")
+
+
+def encoding_qualities(header):
+    """
+    ``{coding: quality}`` of an ``Accept-Encoding`` header, keeping the
+    codings refused with ``q=0``.
+    """
+    qualities = {}
+    for part in (header or "").split(","):
+        match = ENCODING_RE.match(part)
+        if not match:
+            continue
+        encoding, quality = match.groups()
+        try:
+            qualities[encoding.lower()] = 1.0 if quality is None else float(quality)
+        except ValueError:
+            continue
+    return qualities
+
+
+def choose_encoding(header):
+    qualities = encoding_qualities(header)
+
+    def acceptable(encoding):
+        # An explicit entry, even q=0, overrides the "*" wildcard
+        return qualities.get(encoding, qualities.get("*", 0)) > 0
+
+    if brotli is not None and acceptable("br"):
+        return "br"
+    if acceptable("gzip"):
+        return "gzip"
+    return None
+
+
+def compress(content, encoding):
+    options = settings.RESPONSE_COMPRESSION
+    if encoding == "br":
+        return brotli.compress(content, quality=options["brotli_quality"])
+    return gzip.compress(content, compresslevel=options["gzip_level"], mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, whichever the client prefers
+    and is available, once they are larger than
+    ``RESPONSE_COMPRESSION["min_size"]``.
+
+    Streaming responses (evidence files, ranges) are left alone, as are
+    types that don't compress such as images and video.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self._compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._compress(request, await self.get_response(request))
+
+    def _compress(self, request, response):
+        if response.streaming or response.status_code not in (200, 201, 203):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if (
+            response.has_header("Content-Encoding")
+            or len(response.content) < settings.RESPONSE_COMPRESSION["min_size"]
+            or not COMPRESSIBLE_TYPES.match(response.get("Content-Type", ""))
+        ):
+            return response
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"))
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        # The compressed bytes differ from what a strong ETag promised
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,132 @@
+import hashlib
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+# Replica chosen for the request being handled, when it may read from one
+_replica = ContextVar("replica", default=None)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def replicas():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica_")]
+
+
+class ReplicaRouter:
+    """
+    Sends reads of requests marked by ``ReplicaRoutingMiddleware`` to the
+    replica picked for that request, and everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        # Database cache entries hold the read-your-writes pins themselves
+        if model._meta.app_label == "django_cache":
+            return "default"
+        return _replica.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+def client_key(request):
+    """
+    Identifies the client a request comes from, for read-your-writes.
+    """
+    identity = (
+        request.headers.get("X-Api-Key")
+        or request.headers.get("X-Wallet-Address")
+        or request.META.get("REMOTE_ADDR", "")
+    )
+    return "replica-pin:" + hashlib.sha256(identity.encode()).hexdigest()
+
+
+def pin_cache():
+    """
+    The cache holding read-your-writes pins. A client's next request may
+    land on any worker, so a per-process cache would let it read stale data.
+    """
+    if settings.REPLICA_PIN_CACHE not in settings.CACHES:
+        raise ImproperlyConfigured(
+            f"Read replicas need the shared cache {settings.REPLICA_PIN_CACHE!r}"
+        )
+    pins = caches[settings.REPLICA_PIN_CACHE]
+    if isinstance(pins, (LocMemCache, DummyCache)):
+        raise ImproperlyConfigured(
+            f"Cache {settings.REPLICA_PIN_CACHE!r} is not shared between "
+            "processes; read replicas need one that is"
+        )
+    return pins
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets GET requests to ``REPLICA_READ_VIEWS`` read from one replica, except
+    for clients that wrote within the last ``REPLICA_STICKY_SECONDS``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pins = pin_cache() if replicas() else None
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _should_pin(self, request, response):
+        return (
+            self.pins is not None
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        )
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.set(None)
+
+        if self._should_pin(request, response):
+            self.pins.set(client_key(request), True, settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica.set(None)
+
+        if self._should_pin(request, response):
+            await self.pins.aset(
+                client_key(request), True, settings.REPLICA_STICKY_SECONDS
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            self.pins is not None
+            and request.method in SAFE_METHODS
+            and request.resolver_match.url_name in settings.REPLICA_READ_VIEWS
+            and not self.pins.get(client_key(request))
+        ):
+            # One replica for the whole request, so its count and page
+            # queries see the same snapshot
+            _replica.set(random.choice(replicas()))
+        return None
@@ -0,0 +1,114 @@
+"""
+Prometheus metrics of the API, the Sui RPC client and the background jobs.
+
+Under gunicorn (or any multi-process setup), point PROMETHEUS_MULTIPROC_DIR
+at an empty directory before the processes start; every process then writes
+its samples there and ``/metrics`` aggregates them. See gunicorn.conf.py.
+"""
+
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+VIEW_LATENCY = Histogram(
+    "scamshield_view_latency_seconds",
+    "Time to handle a request, by URL name",
+    ["view", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+VIEW_RESPONSES = Counter(
+    "scamshield_view_responses_total",
+    "Responses sent, by URL name and status code",
+    ["view", "method", "status"],
+)
+RPC_LATENCY = Histogram(
+    "scamshield_rpc_latency_seconds",
+    "Duration of Sui JSON-RPC calls, including time spent waiting for the guard",
+    ["network", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+RPC_ERRORS = Counter(
+    "scamshield_rpc_errors_total",
+    "Failed Sui JSON-RPC calls, by exception type",
+    ["network", "method", "error"],
+)
+# Per process; in multiprocess mode /metrics shows the worst worker
+RPC_CIRCUIT_STATE = Gauge(
+    "scamshield_rpc_circuit_state",
+    "Circuit breaker state of a Sui network: 0 closed, 1 half-open, 2 open",
+    ["network"],
+    multiprocess_mode="max",
+)
+RPC_CIRCUIT_FAILURES = Gauge(
+    "scamshield_rpc_circuit_consecutive_failures",
+    "Consecutive failed or slow Sui RPC calls counted by the circuit breaker",
+    ["network"],
+    multiprocess_mode="max",
+)
+JOB_REPORTS = Counter(
+    "scamshield_job_reports_total",
+    "Reports handled by fetch_reports and sync_reports, by outcome",
+    ["job", "outcome"],
+)
+JOB_BATCH_SECONDS = Histogram(
+    "scamshield_job_batch_seconds",
+    "Duration of one fetch_reports run or sync_reports batch",
+    ["job"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        return self._observe(request, response, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        return self._observe(request, response, started)
+
+    def _observe(self, request, response, started):
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        VIEW_LATENCY.labels(view, request.method).observe(time.perf_counter() - started)
+        VIEW_RESPONSES.labels(view, request.method, str(response.status_code)).inc()
+        return response
+
+
+def metrics_view(request):
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        # MultiProcessCollector refuses a directory that does not exist yet
+        os.makedirs(directory, exist_ok=True)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,153 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+
+logger = logging.getLogger("scamshield.profiling")
+
+# Profile of the request being handled, when it was sampled
+_current = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.rpc_calls = 0
+        self.rpc_time = 0.0
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed with connection.execute_wrapper()
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += time.perf_counter() - started
+
+    def server_timing(self, total):
+        return ", ".join(
+            [
+                f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"',
+                f'rpc;dur={self.rpc_time * 1000:.1f};desc="{self.rpc_calls} calls"',
+                f"render;dur={self.render_time * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ]
+        )
+
+
+def record_rpc(seconds):
+    """
+    Count a Sui RPC call towards the current request's profile, if any.
+    """
+    profile = _current.get()
+    if profile is not None:
+        profile.rpc_calls += 1
+        profile.rpc_time += seconds
+
+
+class ProfilingMiddleware:
+    """
+    For a sample of ``REQUEST_PROFILING_SAMPLE_RATE`` of requests, counts and
+    times database queries, Sui RPC calls and response rendering, and reports
+    them in a ``Server-Timing`` header and a JSON log line on
+    ``scamshield.profiling``. Unsampled requests pay one random() call.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _wrap_connections(self, stack, profile):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile))
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if random.random() >= settings.REQUEST_PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            with ExitStack() as stack:
+                self._wrap_connections(stack, profile)
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._report(request, response, profile)
+
+    async def __acall__(self, request):
+        if random.random() >= settings.REQUEST_PROFILING_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        stack = ExitStack()
+        try:
+            # Queries of async views run on the request's sync thread, whose
+            # connections are not the event loop's
+            await sync_to_async(self._wrap_connections)(stack, profile)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current.reset(token)
+        return self._report(request, response, profile)
+
+    def _report(self, request, response, profile):
+        total = time.perf_counter() - profile.started
+        response["Server-Timing"] = profile.server_timing(total)
+        match = request.resolver_match
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "view": match.view_name if match else None,
+                    "status": response.status_code,
+                    "total_ms": round(total * 1000, 1),
+                    "db_queries": profile.db_queries,
+                    "db_ms": round(profile.db_time * 1000, 1),
+                    "rpc_calls": profile.rpc_calls,
+                    "rpc_ms": round(profile.rpc_time * 1000, 1),
+                    "render_ms": round(profile.render_time * 1000, 1),
+                }
+            )
+        )
+        return response
+
+
+class TimedRenderMixin:
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            profile = _current.get()
+            if profile is not None:
+                profile.render_time += time.perf_counter() - started
+
+
+class TimedJSONRenderer(TimedRenderMixin, JSONRenderer):
+    pass
+
+
+class TimedBrowsableAPIRenderer(TimedRenderMixin, BrowsableAPIRenderer):
+    pass
@@ -0,0 +1,100 @@
+"""
+The OpenAPI schema, built once by ``manage.py build_schema`` and served from
+the stored artifact instead of being introspected on every request.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.views import View
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.views import SpectacularAPIView
+
+FORMATS = {
+    "yaml": ("schema.yaml", OpenApiYamlRenderer),
+    "json": ("schema.json", OpenApiJsonRenderer),
+}
+
+_artifacts = {}
+_artifacts_lock = threading.Lock()
+
+
+def build_schema(directory=None):
+    """
+    Generate the schema and write it in every format; returns the paths.
+    """
+    directory = Path(directory or settings.OPENAPI_SCHEMA_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    paths = []
+    for filename, renderer in FORMATS.values():
+        path = directory / filename
+        # Written next to the target and renamed, so workers never read half a file
+        partial = path.with_suffix(path.suffix + ".tmp")
+        partial.write_bytes(renderer().render(schema, renderer_context={}))
+        os.replace(partial, path)
+        paths.append(path)
+    return paths
+
+
+def load_artifact(format):
+    """
+    ``(body, etag)`` of a stored schema, re-read only when the file changes.
+    """
+    path = Path(settings.OPENAPI_SCHEMA_DIR) / FORMATS[format][0]
+    mtime = path.stat().st_mtime_ns
+    with _artifacts_lock:
+        cached = _artifacts.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+    body = path.read_bytes()
+    etag = f'"{hashlib.sha256(body).hexdigest()}"'
+    with _artifacts_lock:
+        _artifacts[path] = (mtime, body, etag)
+    return body, etag
+
+
+def negotiate(request):
+    format = request.GET.get("format")
+    if format in FORMATS:
+        return format
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+class SchemaArtifactView(View):
+    """
+    Serve the schema built by ``build_schema`` with a strong ETag.
+
+    In DEBUG, ``?live=1`` (or a missing artifact) generates it per request
+    instead, so schema changes show up without a rebuild.
+    """
+
+    def get(self, request):
+        format = negotiate(request)
+        if settings.DEBUG and (
+            request.GET.get("live")
+            or not (Path(settings.OPENAPI_SCHEMA_DIR) / FORMATS[format][0]).exists()
+        ):
+            return SpectacularAPIView.as_view()(request)
+
+        try:
+            body, etag = load_artifact(format)
+        except FileNotFoundError:
+            return JsonResponse(
+                {"error": "Schema not built; run manage.py build_schema"}, status=503
+            )
+
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type=FORMATS[format][1].media_type)
+        response["ETag"] = etag
+        # Clients revalidate, which costs a 304 and no introspection
+        response["Cache-Control"] = "no-cache"
+        response["Vary"] = "Accept"
+        return response
@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 from corsheaders.defaults import default_headers
 
@@ -12,6 +13,13 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = "django-insecure-t)!b$nbt_%v$cta!r7oe*-9(6o6og0(f6i#dhsd6jzjjr66e%2"
 
+# Keys of authy.Fields.EncryptedField by version, newest (primary) first.
+# To rotate, add a new version at the top and run `manage.py rotate_encryption_keys`;
+# drop old versions once that has completed.
+FIELD_ENCRYPTION_KEYS = {
+    "1": SECRET_KEY,
+}
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -37,6 +45,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "scamshield.metrics.MetricsMiddleware",
+    "scamshield.profiling.ProfilingMiddleware",
+    "scamshield.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -45,8 +56,38 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "scamshield.db_router.ReplicaRoutingMiddleware",
 ]
 
+# Responses smaller than min_size bytes go out uncompressed. Brotli quality 4
+# and gzip level 6 trade a little ratio for much less CPU than the maximums.
+RESPONSE_COMPRESSION = {
+    "min_size": int(os.environ.get("RESPONSE_COMPRESSION_MIN_SIZE", 1024)),
+    "gzip_level": 6,
+    "brotli_quality": 4,
+}
+
+# Share of requests that get a Server-Timing header and a profile log line;
+# none under `manage.py test`, where the lines would drown the test output
+TESTING = sys.argv[1:2] == ["test"]
+REQUEST_PROFILING_SAMPLE_RATE = float(
+    os.environ.get(
+        "REQUEST_PROFILING_SAMPLE_RATE",
+        "0" if TESTING else "1" if DEBUG else "0.05",
+    )
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "scamshield.profiling": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 ROOT_URLCONF = "scamshield.urls"
 
 TEMPLATES = [
@@ -67,11 +108,43 @@ TEMPLATES = [
 
 AUTH_USER_MODEL = "authy.User"
 
+# Wallet address -> user lookups done by WalletAddressAuthentication are kept
+# in a per-process LRU of `size` entries for `ttl` seconds. Set `shared_cache`
+# to the alias of a cache in CACHES to share them between processes too.
+WALLET_AUTH_CACHE = {
+    "size": 10000,
+    "ttl": 300,
+    "shared_cache": os.environ.get("WALLET_AUTH_SHARED_CACHE") or None,
+}
+# Same for API key -> merchant lookups done by MerchantApiKeyAuthentication.
+# Keep the ttl short: it is how long a replaced key keeps working in other processes.
+MERCHANT_KEY_CACHE = {
+    "size": 10000,
+    "ttl": 60,
+    "shared_cache": os.environ.get("WALLET_AUTH_SHARED_CACHE") or None,
+}
+# Per-merchant token buckets (requests per second, burst) by view throttle_scope
+MERCHANT_RATE_LIMITS = {
+    "scammer-check": {"rate": 10, "burst": 50},
+    "reports": {"rate": 5, "burst": 20},
+    "pending-verifications": {"rate": 2, "burst": 10},
+}
+# Seconds between flushes of buffered merchant usage counts to authy.MerchantUsage
+USAGE_FLUSH_INTERVAL = 10
+
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "scamshield.authentication.MerchantApiKeyAuthentication",
         "scamshield.authentication.WalletAddressAuthentication",
     ],
+    "DEFAULT_THROTTLE_CLASSES": [
+        "scamshield.throttling.MerchantRateThrottle",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "scamshield.renderers.TimedORJSONRenderer",
+        "scamshield.profiling.TimedBrowsableAPIRenderer",
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
@@ -83,11 +156,29 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
 }
+# Written by `manage.py build_schema` and served by scamshield.schema
+OPENAPI_SCHEMA_DIR = os.environ.get(
+    "OPENAPI_SCHEMA_DIR", os.path.join(BASE_DIR, "openapi")
+)
 
 WSGI_APPLICATION = "scamshield.wsgi.application"
 # Media settings for evidence files
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+# Chunked evidence uploads are assembled here before being stored as evidence
+EVIDENCE_UPLOAD_DIR = os.path.join(MEDIA_ROOT, "uploads")
+EVIDENCE_UPLOAD_MAX_CHUNK = 8 * 1024 * 1024
+EVIDENCE_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+# Hand evidence file bodies to the web server: None, "x-sendfile" (Apache,
+# lighttpd) or "x-accel-redirect" (nginx, with an internal location mapping
+# EVIDENCE_ACCEL_REDIRECT_PREFIX to MEDIA_ROOT)
+EVIDENCE_SENDFILE = os.environ.get("EVIDENCE_SENDFILE") or None
+EVIDENCE_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+# Thumbnails and previews of evidence media are built outside the web workers
+# by `manage.py build_evidence_derivatives --watch`, with this many threads
+EVIDENCE_DERIVATIVE_WORKERS = 2
+EVIDENCE_THUMBNAIL_SIZE = 320
+EVIDENCE_PREVIEW_SIZE = 1280
 
 STATIC_URL = '/static/'
 STATIC_ROOT = '/var/www/scamshield/staticfiles'
@@ -98,9 +189,92 @@ STATIC_ROOT = '/var/www/scamshield/staticfiles'
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+    }
+}
+
+# SQLITE_PRODUCTION=1 tunes SQLite for concurrent use: WAL lets readers run
+# alongside the writer, IMMEDIATE transactions take the write lock when they
+# begin (so they wait for it instead of failing to upgrade a read lock), and
+# busy_timeout makes them wait up to that many ms before "database is locked".
+# See benchmarks/sqlite_concurrency.py.
+if os.environ.get("SQLITE_PRODUCTION"):
+    DATABASES["default"]["OPTIONS"] = {
+        "init_command": (
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            f"PRAGMA busy_timeout={int(os.environ.get('SQLITE_BUSY_TIMEOUT', '5000'))};"
+            "PRAGMA mmap_size=268435456;"  # 256 MiB
+            "PRAGMA cache_size=-65536;"  # 64 MiB
+            "PRAGMA temp_store=MEMORY;"
+        ),
+        "transaction_mode": "IMMEDIATE",
+    }
+
+# PostgreSQL is used when POSTGRES_DB is set. Connections persist for
+# POSTGRES_CONN_MAX_AGE seconds, or come from a psycopg pool of up to
+# POSTGRES_POOL_MAX_SIZE connections per process when that is set.
+# POSTGRES_REPLICA_HOSTS (comma separated) adds read replicas, see
+# scamshield.db_router.
+if os.environ.get("POSTGRES_DB"):
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ["POSTGRES_DB"],
+        "USER": os.environ.get("POSTGRES_USER", "postgres"),
+        "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+        "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+        "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
     }
+    if os.environ.get("POSTGRES_POOL_MAX_SIZE"):
+        # Pooled connections are returned to the pool after each request
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.environ.get("POSTGRES_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ["POSTGRES_POOL_MAX_SIZE"]),
+            "timeout": 10,
+        }
+    for index, host in enumerate(
+        h.strip() for h in os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")
+    ):
+        if host:
+            DATABASES[f"replica_{index}"] = {
+                **DATABASES["default"],
+                "HOST": host,
+                "TEST": {"MIRROR": "default"},
+            }
+
+DATABASE_ROUTERS = ["scamshield.db_router.ReplicaRouter"]
+# Views (URL names) whose GET requests may read from a replica
+REPLICA_READ_VIEWS = [
+    "scammer-check",
+    "dashboard-stats",
+    "scamreport-list",
+    "scamreport-detail",
+]
+# After a write, the same client reads from the primary for this many seconds
+# so it sees its own changes.
+REPLICA_STICKY_SECONDS = 10
+# Those pins must be seen by every worker, so replicas are only used with a
+# shared cache: Redis at REPLICA_PIN_CACHE_URL, or else a table on the primary
+# (run `manage.py createcachetable`).
+REPLICA_PIN_CACHE = "replica_pins"
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
 }
+if any(alias.startswith("replica_") for alias in DATABASES):
+    if os.environ.get("REPLICA_PIN_CACHE_URL"):
+        CACHES[REPLICA_PIN_CACHE] = {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REPLICA_PIN_CACHE_URL"],
+        }
+    else:
+        CACHES[REPLICA_PIN_CACHE] = {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "replica_pins",
+        }
 
 
 # Password validation
@@ -144,4 +318,48 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-SUI_RPC_ENDPOINT = "https://fullnode.devnet.sui.io/"
+# Serve scammer-check/ and api/verify-sui-transaction/ with async views. Enable
+# when running under ASGI (e.g. `uvicorn scamshield.asgi:application`).
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "").lower() in ("1", "true", "yes")
+
+# Sui JSON-RPC: one connection pool and concurrency limit per network
+SUI_DEFAULT_NETWORK = os.environ.get("SUI_NETWORK", "testnet")
+SUI_NETWORKS = {
+    "devnet": {
+        "endpoint": os.environ.get("SUI_DEVNET_RPC", "https://fullnode.devnet.sui.io:443"),
+        "pool_size": 10,
+        "max_concurrency": 8,
+        "async_max_concurrency": 50,  # requests in flight per event loop
+    },
+    "testnet": {
+        "endpoint": os.environ.get("SUI_TESTNET_RPC", "https://fullnode.testnet.sui.io:443"),
+        "pool_size": 10,
+        "max_concurrency": 8,
+        "async_max_concurrency": 50,
+    },
+    "mainnet": {
+        "endpoint": os.environ.get("SUI_MAINNET_RPC", "https://fullnode.mainnet.sui.io:443"),
+        "pool_size": 10,
+        "max_concurrency": 8,
+        "async_max_concurrency": 50,
+    },
+}
+# Send every network's RPC traffic to one node instead, e.g. the local
+# stand-in started with `manage.py sui_standin` for benchmarks and tests
+SUI_RPC_OVERRIDE = os.environ.get("SUI_RPC_OVERRIDE")
+SUI_RPC_TIMEOUT = 10  # seconds
+# Circuit breaker and adaptive rate limit applied to each network
+# (override per network with a "guard" entry in SUI_NETWORKS)
+SUI_RPC_GUARD = {
+    "rate": 20,  # requests per second when healthy
+    "burst": 40,
+    "min_rate": 1,
+    "failure_threshold": 5,  # consecutive failed or slow calls before opening
+    "latency_threshold": 3.0,  # seconds; slower calls count as failures
+    "reset_timeout": 30,  # seconds before a half-open probe is allowed
+    "half_open_probes": 1,
+    "acquire_timeout": 1.0,  # seconds to wait for a rate limit token
+}
+SUI_RPC_CACHE_TIMEOUT = 60 * 60
+# Package the scam_shield Move module is published under (used to filter its events)
+SUI_PACKAGE_ID = os.environ.get("SUI_PACKAGE_ID", "scam_shield")
@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from authy.models import Merchant
+from authy.usage import usage_meter
+from core.rpc import TokenBucket
+
+
+class MerchantRateThrottle(BaseThrottle):
+    """
+    Token-bucket rate limit per merchant and ``throttle_scope``, configured
+    in ``MERCHANT_RATE_LIMITS``. Only requests authenticated with an API key
+    are limited, and buckets live in the process that serves the request.
+
+    Allowed requests are also counted towards the merchant's usage of the
+    scope.
+    """
+
+    _buckets = OrderedDict()
+    _lock = threading.Lock()
+    _max_buckets = 10000
+
+    def _bucket(self, key, limit):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(limit["rate"], limit["burst"])
+                self._buckets[key] = bucket
+                while len(self._buckets) > self._max_buckets:
+                    self._buckets.popitem(last=False)
+            self._buckets.move_to_end(key)
+            return bucket
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        scope = getattr(view, "throttle_scope", None)
+        if scope is None or not isinstance(request.auth, Merchant):
+            return True
+
+        self.retry_after = self.check(request.auth, scope)
+        return not self.retry_after
+
+    def check(self, merchant, scope):
+        """
+        Count a call of ``merchant`` to ``scope`` if its limit allows it.
+        Returns the seconds to wait otherwise (0 means allowed).
+        """
+        limit = settings.MERCHANT_RATE_LIMITS.get(scope)
+        if limit is not None:
+            wait = self._bucket((scope, merchant.pk), limit).try_acquire()
+            if wait:
+                return wait
+        usage_meter.record(merchant.pk, scope)
+        return 0
+
+    def wait(self):
+        return self.retry_after
@@ -4,17 +4,18 @@ from django.conf.urls.static import static
 from django.conf import settings
 
 from drf_spectacular.views import (
-    SpectacularAPIView,
     SpectacularRedocView,
     SpectacularSwaggerView,
 )
 
 from core.urls import urlpatterns as core_urls_pattern
 from authy.urls import url_patterns as authy_urls_pattern
+from scamshield.metrics import metrics_view
+from scamshield.schema import SchemaArtifactView
 
 urlpatterns = [
     # YOUR PATTERNS
-    re_path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    re_path("api/schema/", SchemaArtifactView.as_view(), name="schema"),
     # Optional UI:
     re_path(
         "apidocs",
@@ -29,6 +30,7 @@ urlpatterns = [
 ]
 urlpatterns += [
     re_path("admin/", admin.site.urls),
+    re_path("^metrics$", metrics_view, name="metrics"),
 ]
 urlpatterns += core_urls_pattern
 urlpatterns += authy_urls_pattern